@@ -0,0 +1,54 @@
+"""Numeric comment sentiment score
+
+Revision ID: 7912ec9905e3
+Revises: f9e206b45652
+Create Date: 2026-10-17 12:48:05.117349
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7912ec9905e3'
+down_revision: Union[str, Sequence[str], None] = 'f9e206b45652'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NUMERIC = r"'^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$'"
+
+
+def _to_float(table: str) -> None:
+    # Values that don't parse as numbers can't be cast; clear them first
+    op.execute(
+        f"UPDATE {table} SET sentiment_score = NULL "
+        f"WHERE sentiment_score IS NOT NULL AND trim(sentiment_score) !~ {NUMERIC}"
+    )
+    op.alter_column(table, 'sentiment_score',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(),
+               type_=sa.Float(),
+               postgresql_using='trim(sentiment_score)::double precision',
+               existing_nullable=True)
+
+
+def _to_string(table: str) -> None:
+    op.alter_column(table, 'sentiment_score',
+               existing_type=sa.Float(),
+               type_=sqlmodel.sql.sqltypes.AutoString(),
+               postgresql_using='sentiment_score::text',
+               existing_nullable=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _to_float('comments')
+    _to_float('sentiment_cache')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _to_string('sentiment_cache')
+    _to_string('comments')
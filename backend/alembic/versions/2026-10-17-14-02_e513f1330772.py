@@ -0,0 +1,29 @@
+"""Draft stats version
+
+Revision ID: e513f1330772
+Revises: 7912ec9905e3
+Create Date: 2026-10-17 14:02:33.481920
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e513f1330772'
+down_revision: Union[str, Sequence[str], None] = '7912ec9905e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('draft_stats', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.alter_column('draft_stats', 'version', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('draft_stats', 'version')
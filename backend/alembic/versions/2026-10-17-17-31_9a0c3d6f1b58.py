@@ -0,0 +1,39 @@
+"""Draft summary status
+
+Revision ID: 9a0c3d6f1b58
+Revises: 5e21a7b9c0f4
+Create Date: 2026-10-17 17:31:55.418062
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a0c3d6f1b58'
+down_revision: Union[str, Sequence[str], None] = '5e21a7b9c0f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing drafts were summarised on upload
+    op.add_column('drafts', sa.Column('summary_status', sqlmodel.sql.sqltypes.AutoString(), server_default='done', nullable=False))
+    op.add_column('drafts', sa.Column('summary_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('drafts', sa.Column('summary_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('drafts', sa.Column('summary_started_at', sa.DateTime(), nullable=True))
+    op.alter_column('drafts', 'summary_status', server_default=None)
+    op.alter_column('drafts', 'summary_attempts', server_default=None)
+    op.create_index(op.f('ix_drafts_summary_status'), 'drafts', ['summary_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_drafts_summary_status'), table_name='drafts')
+    op.drop_column('drafts', 'summary_started_at')
+    op.drop_column('drafts', 'summary_error')
+    op.drop_column('drafts', 'summary_attempts')
+    op.drop_column('drafts', 'summary_status')
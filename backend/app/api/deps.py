@@ -1,11 +1,15 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections.abc import AsyncGenerator
 
 from app.db.database import AsyncSessionLocal
+from app.core.config import settings
 from app.core.jwt import decode_access_token
 from app.models.user_model import User
+from app.utils.user_cache import user_cache
 
 auth_scheme = APIKeyHeader(name="Authorization")
 
@@ -20,7 +24,21 @@ async def get_current_user(
     payload = decode_access_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
-    user = await db.get(User, payload["sub"])
+    try:
+        user_id = UUID(payload["sub"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
+
+    # The session is only bound to a connection on its first query, so
+    # neither of these paths checks one out of the pool
+    if settings.AUTH_TOKEN_CLAIMS and "username" in payload and "email" in payload:
+        return User(id=user_id, username=payload["username"], email=payload["email"])
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.set(user)
     return user
\ No newline at end of file
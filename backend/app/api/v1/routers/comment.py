@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, UploadFile, File, status, Query
+from fastapi import APIRouter, Depends, UploadFile, File, status, Query, Response
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.schemas.comment_schema import CommentCreate, CommentRead
+from app.schemas.job_schema import AnalysisJobRead
 from app.api.deps import get_db, get_current_user
 from app.models.user_model import User
 from app.controllers.comment import (
     add_comment_controller,
     add_comments_from_csv_controller,
+    stream_comments_from_csv_controller,
     get_comments_by_draft_controller,
+    export_comments_controller,
+    create_analysis_job_controller,
+    get_analysis_job_controller,
+    get_analysis_job_results_controller,
 )
 
 router = APIRouter()
@@ -31,12 +38,74 @@ async def add_comments_from_csv(
 ):
     return await add_comments_from_csv_controller(draft_id, file, db)
 
+@router.post("/draft/{draft_id}/csv/stream")
+async def stream_comments_from_csv(
+    draft_id: UUID,
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    frames = await stream_comments_from_csv_controller(draft_id, file, format, db, current_user)
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/draft/{draft_id}/csv/jobs", response_model=AnalysisJobRead, status_code=202)
+async def create_analysis_job(
+    draft_id: UUID,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await create_analysis_job_controller(draft_id, file, db, current_user)
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobRead)
+async def get_analysis_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_analysis_job_controller(job_id, db, current_user)
+
+@router.get("/jobs/{job_id}/results", response_model=list[CommentRead])
+async def get_analysis_job_results(
+    job_id: UUID,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_analysis_job_results_controller(job_id, limit, offset, db, current_user)
+
 @router.get("/draft/{draft_id}", response_model=list[CommentRead])
 async def get_comments_by_draft(
     draft_id: UUID,
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    comments, next_cursor = await get_comments_by_draft_controller(draft_id, limit, db, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return comments
+
+@router.get("/draft/{draft_id}/export")
+async def export_comments(
+    draft_id: UUID,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    comments = await get_comments_by_draft_controller(draft_id, limit, db)
-    return comments
\ No newline at end of file
+    rows = await export_comments_controller(draft_id, format, db, current_user)
+    if format == "csv":
+        return StreamingResponse(
+            rows,
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=draft_{draft_id}_comments.csv"},
+        )
+    return StreamingResponse(rows, media_type="application/x-ndjson")
\ No newline at end of file
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, Query, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.schemas.draft_schema import DraftRead
+from app.schemas.draft_schema import DraftListItem, DraftRead
 from app.crud.draft_crud import draft_crud
 from app.api.deps import get_db, get_current_user
 from app.models.user_model import User
-from app.controllers.draft import draft_create, get_drafts_by_id_controller, generate_report_controller
+from app.controllers.draft import draft_create, get_drafts_by_id_controller, generate_report_controller, stream_summary_events
+from app.utils.report_cache import report_cache
+from app.utils.worker_pool import PoolSaturated, PoolTimeout
+from app.utils.pdf_extractor import PdfLimitExceeded
 
 router = APIRouter()
 
@@ -16,21 +20,68 @@ async def create_draft(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    draft = await draft_create(file=file, db=db, current_user=current_user)
+    try:
+        draft = await draft_create(file=file, db=db, current_user=current_user)
+    except PdfLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except PoolTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     
     return draft
 
 @router.get("/{draft_id}", response_model=DraftRead)
 async def get_draft(
     draft_id: UUID,
+    include_text: bool = Query(True, description="Set to false to leave out the draft text; see /{draft_id}/text"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    draft = await draft_crud.get(db, id=draft_id, user_id=current_user.id)
+    draft = await draft_crud.get(db, id=draft_id, user_id=current_user.id, with_text=include_text)
     if not draft:
         raise HTTPException(status_code=404, detail="Draft not found")
+    if not include_text:
+        # The text column wasn't loaded, so it mustn't be touched here
+        return DraftRead(**{name: getattr(draft, name) for name in DraftRead.model_fields if name != "draft"})
     return draft
 
+# offset and length go to Postgres substr, whose arguments are int4 (offset as offset + 1)
+PG_INT_MAX = 2**31 - 1
+
+@router.get("/{draft_id}/text", response_class=PlainTextResponse)
+async def get_draft_text(
+    draft_id: UUID,
+    offset: int = Query(0, ge=0, le=PG_INT_MAX - 1, description="First character to return"),
+    length: int | None = Query(
+        None, ge=1, le=PG_INT_MAX, description="Characters to return; the rest of the text when omitted"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    text = await draft_crud.get_text(db, id=draft_id, user_id=current_user.id, offset=offset, length=length)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    content, total = text
+    headers = {"X-Text-Length": str(total)}
+    if offset + len(content) < total:
+        headers["X-Next-Offset"] = str(offset + len(content))
+    return PlainTextResponse(content, headers=headers)
+
+@router.get("/{draft_id}/summary/events")
+async def get_summary_events(
+    draft_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not await draft_crud.get(db, id=draft_id, user_id=current_user.id, with_text=False):
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return StreamingResponse(
+        stream_summary_events(draft_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.delete("/{draft_id}", status_code=204)
 async def delete_draft(
     draft_id: UUID,
@@ -40,20 +91,23 @@ async def delete_draft(
     draft = await draft_crud.remove(db, id=draft_id, user_id=current_user.id)
     if not draft:
         raise HTTPException(status_code=404, detail="Draft not found")
+    await report_cache.invalidate(draft_id)
     return
 
-@router.get("/", response_model=list[DraftRead])
+@router.get("/", response_model=list[DraftListItem])
 async def get_drafts_by_id(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    limit: int = Query(100, ge=1, le=1000)
+    limit: int = Query(100, ge=1, le=1000),
+    include_stats: bool = Query(False, description="Add each draft's comment count and sentiment mix"),
 ):
-    drafts = await get_drafts_by_id_controller(db, limit, current_user)
+    drafts = await get_drafts_by_id_controller(db, limit, current_user, include_stats)
     return drafts
 
 @router.post("/{draft_id}/report")
 async def generate_report(
     draft_id: UUID,
+    format: str = Query("pdf", pattern="^(pdf|html|md|csv|json)$"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -62,9 +116,21 @@ async def generate_report(
             db=db,
             user_id=current_user.id,
             draft_id=draft_id,
-            format="pdf"
+            format=format
         )
-        
+
+        if format == "json":
+            return report
+        if format == "html":
+            return Response(content=report, media_type="text/html")
+        if format == "md":
+            return Response(content=report, media_type="text/markdown")
+        if format == "csv":
+            return Response(
+                content=report,
+                media_type="text/csv",
+                headers={"Content-Disposition": f"attachment; filename=draft_{draft_id}_summary.csv"}
+            )
         return Response(
             content=report,
             media_type="application/pdf",
@@ -73,5 +139,9 @@ async def generate_report(
             
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except PoolTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
\ No newline at end of file
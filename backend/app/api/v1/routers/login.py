@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.schemas.user_schema import UserCreate, UserRead, UserLogin
 from app.crud.user_crud import user_crud
-from app.core.security import verify_password
-from app.core.jwt import create_access_token
+from app.core.security import verify_password_async
+from app.core.jwt import create_access_token, token_claims
 from app.api.deps import get_db  # Your async session dependency
+from app.utils.worker_pool import PoolSaturated, PoolTimeout
 
 router = APIRouter()
 
@@ -12,13 +13,28 @@ router = APIRouter()
 async def register(user_create: UserCreate, db: AsyncSession = Depends(get_db)):
     if await user_crud.get_by_email(db, user_create.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = await user_crud.create(db, obj_in=user_create)
+    try:
+        user = await user_crud.create(db, obj_in=user_create)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except PoolTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return user
 
 @router.post("/login")
 async def login(user_login: UserLogin, db: AsyncSession = Depends(get_db)):
     user = await user_crud.get_by_email(db, user_login.email)
-    if not user or not verify_password(user_login.password, user.hashed_password):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = create_access_token({"sub": str(user.id)})
+    try:
+        valid, new_hash = await verify_password_async(user_login.password, user.hashed_password)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except PoolTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        user = await user_crud.update(db, db_obj=user, obj_in={"hashed_password": new_hash})
+    token = create_access_token(token_claims(user))
     return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
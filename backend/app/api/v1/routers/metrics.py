@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_user
+from app.core.metrics import metrics
+from app.models.user_model import User
+
+router = APIRouter()
+
+@router.get("/")
+async def get_metrics(current_user: User = Depends(get_current_user)):
+    return metrics.snapshot()
\ No newline at end of file
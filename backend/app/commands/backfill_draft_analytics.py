@@ -0,0 +1,41 @@
+"""
+Computes the stored text analytics for drafts uploaded before they existed.
+
+    python -m app.commands.backfill_draft_analytics              # drafts missing analytics
+    python -m app.commands.backfill_draft_analytics <draft_id>   # selected drafts, recomputed
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlmodel import select
+
+from app.crud.draft_crud import draft_crud
+from app.db.database import AsyncSessionLocal
+from app.models.draft_model import Draft
+from app.utils.text_analytics import compute_draft_analytics
+
+BATCH_SIZE = 100
+
+async def backfill(draft_ids: list[UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        query = select(Draft.id)
+        if draft_ids:
+            query = query.where(Draft.id.in_(draft_ids))
+        else:
+            query = query.where(Draft.word_count.is_(None))
+        ids = (await db.exec(query)).all()
+
+        # Texts can be large, so they are loaded a batch at a time
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = ids[start:start + BATCH_SIZE]
+            rows = (await db.exec(select(Draft.id, Draft.draft).where(Draft.id.in_(batch)))).all()
+            for draft_id, text in rows:
+                analytics = await asyncio.to_thread(compute_draft_analytics, text)
+                await draft_crud.set_analytics(db, draft_id, analytics)
+            print(f"backfilled {min(start + BATCH_SIZE, len(ids))}/{len(ids)} drafts")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute stored text analytics for drafts.")
+    parser.add_argument("draft_ids", type=UUID, nargs="*")
+    asyncio.run(backfill(parser.parse_args().draft_ids))
@@ -0,0 +1,27 @@
+"""
+Recomputes draft_stats from the comments table.
+
+    python -m app.commands.rebuild_draft_stats              # every draft
+    python -m app.commands.rebuild_draft_stats <draft_id>   # selected drafts
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from app.crud.draft_stats_crud import draft_stats_crud
+from app.db.database import AsyncSessionLocal
+
+async def rebuild(draft_ids: list[UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        if not draft_ids:
+            count = await draft_stats_crud.rebuild_all(db)
+            print(f"rebuilt stats for {count} drafts with comments")
+            return
+        for draft_id in draft_ids:
+            await draft_stats_crud.rebuild(db, draft_id)
+            print(f"rebuilt stats for draft {draft_id}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute draft_stats from comments.")
+    parser.add_argument("draft_ids", type=UUID, nargs="*")
+    asyncio.run(rebuild(parser.parse_args().draft_ids))
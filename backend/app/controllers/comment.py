@@ -1,13 +1,46 @@
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import UploadFile, HTTPException
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from datetime import datetime, timedelta
+from typing import BinaryIO
 import csv
 import io
 import asyncio
+import logging
+import time
 
-from app.schemas.comment_schema import CommentCreate
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.comment_model import Comment
+from app.models.enums import JobStatus, JobRowStatus
+from app.models.job_model import AnalysisJob
+from app.models.user_model import User
+from app.schemas.comment_schema import CommentCreate, CommentRead
+from app.schemas.job_schema import AnalysisJobRead
 from app.crud.comment_crud import comment_crud
-from app.utils.agent import analysis_agent  # Your custom agent
+from app.crud.draft_crud import draft_crud
+from app.crud.job_crud import analysis_job_crud
+from app.utils.job_runner import JobRunner
+from app.utils.agent import batch_comments, Sentiment
+from app.utils.sentiment_backends import sentiment_backend
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.utils.streaming import ndjson_line, sse_event
+from app.utils.uploads import take_upload
+
+logger = logging.getLogger(__name__)
+
+async def analyse_comment(comment_text: str) -> Sentiment:
+    """
+    Returns the sentiment for a comment from the configured backend.
+    """
+    return await sentiment_backend.analyse(comment_text)
+
+async def analyse_comments(comment_texts: list[str]) -> list[Sentiment]:
+    """
+    Batched counterpart of `analyse_comment`, results are in input order.
+    """
+    return await sentiment_backend.analyse_many(comment_texts)
 
 async def add_comment_controller(
     draft_id: UUID,
@@ -15,59 +48,365 @@ async def add_comment_controller(
     db: AsyncSession,
 ):
     # Use your analysis agent for sentiment
-    sentiment = await analysis_agent.run(comment_in.comment)
-    comment_in.sentiment_analysis = sentiment.output.sentiment_analysis
-    comment_in.sentiment_score = sentiment.output.sentiment_score
-    comment_in.sentiment_keywords = sentiment.output.sentiment_keywords
+    sentiment = await analyse_comment(comment_in.comment)
+    comment_in.sentiment_analysis = sentiment.sentiment_analysis
+    comment_in.sentiment_score = sentiment.sentiment_score
+    comment_in.sentiment_keywords = sentiment.sentiment_keywords
     comment = await comment_crud.create(db, obj_in=comment_in, draft_id=draft_id)
     return comment
 
-async def _process_row(row: dict) -> CommentCreate | None:
-    """
-    Analyzes a single CSV row and returns a CommentCreate object or None.
-    """
-    comment_text = row.get("comment")
-    if not comment_text:
-        return None
-    
-    # This is the async I/O-bound operation we want to run in parallel
-    sentiment = await analysis_agent.run(comment_text)
-    print("comment successfully analysed")
-    return CommentCreate(
-        comment=comment_text,
-        sentiment_analysis=sentiment.output.sentiment_analysis,
-        sentiment_score=sentiment.output.sentiment_score,
-        sentiment_keywords=sentiment.output.sentiment_keywords
+async def _process_rows(comment_texts: list[str]) -> list[CommentCreate]:
+    """
+    Analyzes a batch of non-empty comments and returns CommentCreate objects
+    in the same order.
+    """
+    sentiments = await analyse_comments(comment_texts)
+    return [
+        CommentCreate(
+            comment=comment_text,
+            sentiment_analysis=sentiment.sentiment_analysis,
+            sentiment_score=sentiment.sentiment_score,
+            sentiment_keywords=sentiment.sentiment_keywords
+        )
+        for comment_text, sentiment in zip(comment_texts, sentiments)
+    ]
+
+def _batch_comments(items: Iterable, text=lambda item: item) -> Iterator[list]:
+    return batch_comments(
+        items,
+        max_items=settings.ANALYSIS_BATCH_MAX_COMMENTS,
+        max_tokens=settings.ANALYSIS_BATCH_MAX_TOKENS,
+        text=text,
     )
 
+_DONE = object()
+
+def _iter_csv_file(raw: BinaryIO) -> Iterator[dict]:
+    """
+    Lazily decodes a CSV file and yields one row at a time, so the whole
+    file is never held in memory as a single string.
+    """
+    raw.seek(0)
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # Hand the underlying file back to its owner instead of closing it
+        text.detach()
+
+def _iter_csv_rows(file: UploadFile) -> Iterator[dict]:
+    yield from _iter_csv_file(file.file)
+
+async def stream_comments_from_rows(
+    draft_id: UUID,
+    rows: Iterable[dict],
+    db: AsyncSession,
+    *,
+    concurrency: int | None = None,
+    batch_size: int | None = None,
+    flush_when_idle: bool = False,
+) -> AsyncIterator[list[Comment]]:
+    """
+    Analyzes rows with at most `concurrency` agent calls in flight and yields
+    each batch of `batch_size` comments right after it is written to the db.
+    With `flush_when_idle`, a smaller batch is written as soon as no more
+    results are waiting, for callers that show comments as they arrive.
+    Rows are grouped into multi-comment agent requests per the
+    ANALYSIS_BATCH_* settings.
+
+    Rows are pulled from `rows` only as workers free up and analysed results
+    wait in a bounded queue, so memory stays flat however large the input is.
+    """
+    concurrency = concurrency or settings.CSV_ANALYSIS_CONCURRENCY
+    batch_size = batch_size or settings.CSV_INSERT_BATCH_SIZE
+
+    rows_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+
+    async def produce():
+        comment_texts = (row.get("comment") for row in rows)
+        for comment_batch in _batch_comments(text for text in comment_texts if text):
+            await rows_queue.put(comment_batch)
+        for _ in range(concurrency):
+            await rows_queue.put(_DONE)
+
+    async def work():
+        while (comment_batch := await rows_queue.get()) is not _DONE:
+            for result in await _process_rows(comment_batch):
+                await results_queue.put(result)
+
+    async def run():
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(produce())
+                for _ in range(concurrency):
+                    tg.create_task(work())
+        finally:
+            await results_queue.put(_DONE)
+
+    runner = asyncio.create_task(run())
+    batch: list[CommentCreate] = []
+    try:
+        # Only this generator touches the session, so db writes stay serial
+        while (result := await results_queue.get()) is not _DONE:
+            batch.append(result)
+            if len(batch) >= batch_size or (flush_when_idle and results_queue.empty()):
+                yield await comment_crud.create_many(db, objs_in=batch, draft_id=draft_id)
+                batch = []
+        await runner
+        if batch:
+            yield await comment_crud.create_many(db, objs_in=batch, draft_id=draft_id)
+    finally:
+        runner.cancel()
+
 async def add_comments_from_csv_controller(
     draft_id: UUID,
     file: UploadFile,
     db: AsyncSession,
 ):
-    contents = await file.read()
-    decoded = contents.decode("utf-8")
-    reader = csv.DictReader(io.StringIO(decoded))
-
-    tasks = [_process_row(row) for row in reader]
-    comment_results = await asyncio.gather(*tasks)
-    comments = [result for result in comment_results if result is not None]
+    created_comments = []
+    async for batch in stream_comments_from_rows(draft_id, _iter_csv_rows(file), db):
+        created_comments.extend(batch)
 
-    if not comments:
+    if not created_comments:
         raise HTTPException(
             status_code=400,
             detail="No valid comments found in the uploaded CSV file."
         )
 
-    created_comments = await comment_crud.create_many(
-        db, objs_in=comments, draft_id=draft_id
-    )
     return created_comments
 
+async def _csv_analysis_events(
+    draft_id: UUID,
+    raw: BinaryIO,
+    encode: Callable[[dict, str], str],
+) -> AsyncIterator[str]:
+    started = time.perf_counter()
+    processed = 0
+    try:
+        # The request's session is closed before a streaming body runs
+        async with AsyncSessionLocal() as db:
+            async for batch in stream_comments_from_rows(
+                draft_id, _iter_csv_file(raw), db, flush_when_idle=True
+            ):
+                for comment in batch:
+                    yield encode(CommentRead(**comment.model_dump()).model_dump(mode="json"), "comment")
+                processed += len(batch)
+                yield encode(
+                    {"processed": processed, "elapsed_seconds": round(time.perf_counter() - started, 2)},
+                    "progress",
+                )
+        if not processed:
+            yield encode({"detail": "No valid comments found in the uploaded CSV file."}, "error")
+        yield encode({"processed": processed, "elapsed_seconds": round(time.perf_counter() - started, 2)}, "done")
+    except Exception as e:
+        logger.exception("Streaming CSV analysis for draft %s failed", draft_id)
+        yield encode({"detail": f"Analysis failed: {str(e)}", "processed": processed}, "error")
+    finally:
+        raw.close()
+
+async def stream_comments_from_csv_controller(
+    draft_id: UUID,
+    file: UploadFile,
+    format: str,
+    db: AsyncSession,
+    current_user: User,
+) -> AsyncIterator[str]:
+    """
+    Returns the frames of a streaming CSV analysis: a `comment` frame for
+    every comment once it is saved, a `progress` frame after each saved
+    batch and a final `done` frame, as NDJSON lines or server-sent events.
+    """
+    if not await draft_crud.get(db, id=draft_id, user_id=current_user.id, with_text=False):
+        raise HTTPException(status_code=404, detail="Draft not found")
+
+    raw = await asyncio.to_thread(take_upload, file.file)
+    return _csv_analysis_events(draft_id, raw, sse_event if format == "sse" else ndjson_line)
+
 async def get_comments_by_draft_controller(
     draft_id: UUID,
     limit: int,
     db: AsyncSession,
+    cursor: str | None = None,
+) -> tuple[list[Comment], str | None]:
+    """
+    Returns a page of comments and the cursor for the next page, which is
+    None once the last page has been reached.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    comments = await comment_crud.get_by_draft_id(db, draft_id, limit, after=after)
+    next_cursor = None
+    if len(comments) == limit:
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    return comments, next_cursor
+
+EXPORT_FIELDS = ["id", "created_at", "comment", "sentiment_analysis", "sentiment_score", "sentiment_keywords"]
+
+async def _export_comments(draft_id: UUID, format: str) -> AsyncIterator[str]:
+    # The request's session is closed before a streaming body runs
+    async with AsyncSessionLocal() as db:
+        result = await comment_crud.stream_by_draft_id(
+            db, draft_id, batch_size=settings.COMMENT_EXPORT_BATCH_SIZE
+        )
+        if format == "csv":
+            buffer = io.StringIO()
+            # Keywords are stored as one comma-separated string, which the writer
+            # quotes; null keywords and scores are written as empty fields
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            async for rows in result.partitions():
+                yield "".join(ndjson_line(row._asdict()) for row in rows)
+
+async def export_comments_controller(
+    draft_id: UUID,
+    format: str,
+    db: AsyncSession,
+    current_user: User,
+) -> AsyncIterator[str]:
+    """
+    Returns every comment of a draft as NDJSON lines or CSV rows, read from
+    a server-side cursor so memory stays flat however many there are.
+    """
+    if not await draft_crud.get(db, id=draft_id, user_id=current_user.id, with_text=False):
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return _export_comments(draft_id, format)
+
+def _job_read(job: AnalysisJob) -> AnalysisJobRead:
+    rows_per_second = None
+    if job.started_at and job.processed_rows + job.failed_rows:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0:
+            rows_per_second = round((job.processed_rows + job.failed_rows) / elapsed, 2)
+    return AnalysisJobRead(**job.model_dump(), rows_per_second=rows_per_second)
+
+async def process_analysis_job(job_id: UUID) -> None:
+    """
+    Works through the pending rows of a job in CSV_INSERT_BATCH_SIZE chunks.
+    Each chunk's comments, row statuses and job counters are committed
+    together, so a restarted worker resumes exactly after the last chunk.
+    """
+    stale_after = timedelta(seconds=settings.ANALYSIS_JOB_STALE_SECONDS)
+    async with AsyncSessionLocal() as db:
+        job = await analysis_job_crud.claim(db, job_id, stale_after)
+        if not job:
+            return
+        draft_id = job.draft_id
+
+    semaphore = asyncio.Semaphore(settings.CSV_ANALYSIS_CONCURRENCY)
+
+    async def analyse(rows):
+        async with semaphore:
+            try:
+                return await _process_rows([row.comment for row in rows])
+            except Exception as e:
+                for row in rows:
+                    row.error = str(e)
+                return [None] * len(rows)
+
+    # Each chunk reads its rows and writes its results in separate short
+    # sessions, so no connection sits idle in a transaction while the LLM works
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                rows = await analysis_job_crud.get_pending_rows(
+                    db, job_id, limit=settings.CSV_INSERT_BATCH_SIZE
+                )
+            if not rows:
+                break
+
+            row_batches = _batch_comments(rows, text=lambda row: row.comment)
+            batch_results = await asyncio.gather(*(analyse(batch) for batch in row_batches))
+            results = [result for batch in batch_results for result in batch]
+            analysed = [(row, result) for row, result in zip(rows, results) if result is not None]
+
+            async with AsyncSessionLocal() as db:
+                comments = await comment_crud.create_many(
+                    db, objs_in=[result for _, result in analysed], draft_id=draft_id, commit=False
+                )
+                for (row, _), comment in zip(analysed, comments):
+                    row.status = JobRowStatus.DONE.value
+                    row.comment_id = comment.id
+                for row, result in zip(rows, results):
+                    if result is None:
+                        row.status = JobRowStatus.FAILED.value
+                    # Reattaches the row read in the earlier session
+                    db.add(row)
+                await analysis_job_crud.record_progress(
+                    db, job_id, done=len(analysed), failed=len(rows) - len(analysed)
+                )
+    except Exception as e:
+        async with AsyncSessionLocal() as db:
+            await analysis_job_crud.finish(db, job_id, JobStatus.FAILED, error=str(e))
+        raise
+    async with AsyncSessionLocal() as db:
+        await analysis_job_crud.finish(db, job_id, JobStatus.DONE)
+
+async def get_resumable_analysis_jobs() -> list[UUID]:
+    async with AsyncSessionLocal() as db:
+        return await analysis_job_crud.get_resumable_ids(
+            db, timedelta(seconds=settings.ANALYSIS_JOB_STALE_SECONDS)
+        )
+
+analysis_job_runner = JobRunner(
+    process_analysis_job,
+    workers=settings.ANALYSIS_JOB_WORKERS,
+    recover=get_resumable_analysis_jobs,
+)
+
+async def create_analysis_job_controller(
+    draft_id: UUID,
+    file: UploadFile,
+    db: AsyncSession,
+    current_user: User,
+) -> AnalysisJobRead:
+    if not await draft_crud.get(db, id=draft_id, user_id=current_user.id, with_text=False):
+        raise HTTPException(status_code=404, detail="Draft not found")
+
+    comments = (row.get("comment") for row in _iter_csv_rows(file))
+    job = await analysis_job_crud.create(
+        db,
+        draft_id=draft_id,
+        user_id=current_user.id,
+        comments=(comment for comment in comments if comment),
+    )
+    if not job.total_rows:
+        await analysis_job_crud.remove(db, job)
+        raise HTTPException(
+            status_code=400,
+            detail="No valid comments found in the uploaded CSV file."
+        )
+
+    analysis_job_runner.submit(job.id)
+    return _job_read(job)
+
+async def get_analysis_job_controller(
+    job_id: UUID,
+    db: AsyncSession,
+    current_user: User,
+) -> AnalysisJobRead:
+    job = await analysis_job_crud.get(db, id=job_id, user_id=current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_read(job)
+
+async def get_analysis_job_results_controller(
+    job_id: UUID,
+    limit: int,
+    offset: int,
+    db: AsyncSession,
+    current_user: User,
 ):
-    comments = await comment_crud.get_by_draft_id(db, draft_id, limit)
-    return comments
\ No newline at end of file
+    if not await analysis_job_crud.get(db, id=job_id, user_id=current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await analysis_job_crud.get_results(db, job_id, limit=limit, offset=offset)
\ No newline at end of file
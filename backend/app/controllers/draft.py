@@ -1,24 +1,203 @@
 from app.crud.draft_crud import draft_crud
+from app.crud.draft_stats_crud import draft_stats_crud
 from app.schemas.draft_schema import DraftCreate, DraftRead
-from app.utils.pdf_extractor import extract_text_from_pdf
-from app.utils.agent import summary_agent
+from app.utils.pdf_extractor import stream_pdf_pages
+from app.utils.summariser import summarise_draft
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.utils.report_generator import generate_draft_report_data, generate_html_report, html_to_pdf
+from app.utils.report_generator import generate_draft_report_data, html_to_pdf
+from app.utils.report_templates import REPORT_TEMPLATES, render_report
+from app.utils.report_cache import report_cache
+from app.utils.render_pool import render_pool
+from app.utils.worker_pool import PoolSaturated, PoolTimeout
+from app.utils.text_analytics import compute_draft_analytics
+from app.utils.uploads import hash_upload
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.draft_model import Draft, DraftAnalytics
+from app.models.enums import JobStatus
+from app.db.database import AsyncSessionLocal
+from app.utils.job_runner import JobRunner
+from app.utils.streaming import sse_comment, sse_event
+from collections.abc import AsyncIterator
+from datetime import timedelta
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
 
 async def draft_create(file, db, current_user):
-    draft = extract_text_from_pdf(file.file)
-    summary = await summary_agent.run(draft)
-    draft_in = DraftCreate(draft=draft, summary=summary.output)
-    draft = await draft_crud.create(db, obj_in=draft_in, user_id=current_user.id)
+    content_hash = await asyncio.to_thread(hash_upload, file.file)
+    existing = await draft_crud.get_by_content_hash(
+        db, content_hash, user_id=None if settings.DRAFT_DEDUP_GLOBAL else current_user.id
+    )
+
+    if existing is not None:
+        metrics.increment("draft_dedup.hits")
+        # A summary still being written for the earlier upload is a cache hit once it lands
+        summary = existing.summary if existing.summary_status == JobStatus.DONE.value else None
+        draft_in = DraftCreate(draft=existing.draft, summary=summary)
+        page_offsets = existing.page_offsets
+        analytics = DraftAnalytics(**{name: getattr(existing, name) for name in DraftAnalytics.model_fields})
+    else:
+        metrics.increment("draft_dedup.misses")
+        pages = [page async for page in stream_pdf_pages(file.file)]
+        draft = "".join(pages)
+        page_offsets = list(itertools.accumulate(len(page) for page in pages[:-1]))
+        analytics = await asyncio.to_thread(compute_draft_analytics, draft)
+        draft_in = DraftCreate(draft=draft)
+
+    draft = await draft_crud.create(
+        db, obj_in=draft_in, user_id=current_user.id, analytics=analytics, content_hash=content_hash,
+        page_offsets=page_offsets,
+    )
+    if draft.summary_status == JobStatus.PENDING.value:
+        summary_job_runner.submit(draft.id)
     return draft
 
+def split_pages(text: str, page_offsets: list[int] | None) -> list[str]:
+    """Cuts a draft's text back into its pages; drafts without offsets come back whole."""
+    bounds = [0, *(page_offsets or []), len(text)]
+    return [text[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+async def _summary_heartbeat(draft_id: UUID, interval: float) -> None:
+    # A long summary would otherwise look stale and be claimed a second time
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await draft_crud.touch_summary(db, draft_id)
+        except Exception:
+            logger.warning("Failed to refresh the summary claim of draft %s", draft_id, exc_info=True)
+
+async def process_draft_summary(draft_id: UUID) -> None:
+    """
+    Writes a draft's summary, retrying failed attempts with exponential
+    backoff. Attempts are counted on the draft, so a restarted worker
+    doesn't start the count over; after SUMMARY_MAX_ATTEMPTS it is marked
+    failed. While an attempt runs its claim is refreshed every third of
+    SUMMARY_JOB_STALE_SECONDS.
+    """
+    stale_after = timedelta(seconds=settings.SUMMARY_JOB_STALE_SECONDS)
+    # Sessions are only held around db calls, never across the LLM requests
+    # or the backoff, so a running summary doesn't pin a pooled connection
+    async with AsyncSessionLocal() as db:
+        draft = await draft_crud.claim_summary(db, draft_id, stale_after)
+        if not draft:
+            return
+        pages = split_pages(draft.draft, draft.page_offsets)
+
+    while True:
+        heartbeat = asyncio.create_task(
+            _summary_heartbeat(draft_id, settings.SUMMARY_JOB_STALE_SECONDS / 3)
+        )
+        try:
+            summary = await summarise_draft(pages)
+            break
+        except Exception as e:
+            async with AsyncSessionLocal() as db:
+                attempts = await draft_crud.record_summary_failure(db, draft_id, error=str(e))
+                if attempts >= settings.SUMMARY_MAX_ATTEMPTS:
+                    metrics.increment("summary.failed")
+                    await draft_crud.finish_summary(db, draft_id, JobStatus.FAILED, error=str(e))
+                    raise
+            metrics.increment("summary.retries")
+            delay = settings.SUMMARY_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+        finally:
+            heartbeat.cancel()
+
+    async with AsyncSessionLocal() as db:
+        await draft_crud.finish_summary(db, draft_id, JobStatus.DONE, summary=summary)
+
+async def get_pending_summaries() -> list[UUID]:
+    async with AsyncSessionLocal() as db:
+        return await draft_crud.get_pending_summary_ids(
+            db, timedelta(seconds=settings.SUMMARY_JOB_STALE_SECONDS)
+        )
+
+summary_job_runner = JobRunner(
+    process_draft_summary,
+    workers=settings.SUMMARY_JOB_WORKERS,
+    recover=get_pending_summaries,
+)
+
+def _summary_state(draft: Draft) -> dict:
+    return {
+        "summary_status": draft.summary_status,
+        "summary": draft.summary,
+        "summary_error": draft.summary_error,
+    }
+
+async def stream_summary_events(draft_id: UUID, user_id: UUID) -> AsyncIterator[str]:
+    """
+    Server-sent events for a draft's summary: a `status` event whenever its
+    state changes, ending after `done` or `failed`. The draft is polled with
+    a fresh session each time, since the request's session is closed once
+    streaming starts and the summary may be written by another process.
+    """
+    last_state = None
+    deadline = time.monotonic() + settings.SUMMARY_EVENTS_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        async with AsyncSessionLocal() as db:
+            draft = await draft_crud.get(db, id=draft_id, user_id=user_id, with_text=False)
+        if draft is None:
+            yield sse_event({"detail": "Draft not found"}, event="error")
+            return
+
+        state = _summary_state(draft)
+        if state != last_state:
+            yield sse_event(state, event="status")
+            last_state = state
+        else:
+            yield sse_comment()
+        if draft.summary_status in (JobStatus.DONE.value, JobStatus.FAILED.value):
+            return
+        await asyncio.sleep(settings.SUMMARY_EVENTS_POLL_SECONDS)
+    yield sse_event({"detail": "Timed out waiting for the summary"}, event="timeout")
+
 async def get_drafts_by_id_controller(
     db: AsyncSession,
     limit: int,
     current_user,
+    include_stats: bool = False,
 ):
-    return await draft_crud.get_drafts_by_user(db, user_id=current_user.id, limit=limit)
+    return await draft_crud.get_drafts_by_user(
+        db, user_id=current_user.id, limit=limit, with_stats=include_stats
+    )
+
+async def _render_report(
+        db: AsyncSession,
+        user_id: UUID,
+        draft_id: UUID,
+        version: str,
+        format: str,
+) -> bytes:
+    """
+    Returns the report in the given format from the cache, rendering (and
+    caching) it from the next cheaper format on a miss: pdf from html, the
+    templated formats (html, md, csv) from json, json from the database.
+    """
+    content = await report_cache.get(draft_id, version, format)
+    if content is not None:
+        return content
+
+    if format == "pdf":
+        html_content = await _render_report(db, user_id, draft_id, version, "html")
+        content = await render_pool.run(html_to_pdf, html_content.decode("utf-8"))
+    elif format in REPORT_TEMPLATES:
+        report_data = await _render_report(db, user_id, draft_id, version, "json")
+        content = render_report(json.loads(report_data), format).encode("utf-8")
+    else:
+        report_data = await generate_draft_report_data(db, draft_id, user_id)
+        content = json.dumps(report_data).encode("utf-8")
+
+    await report_cache.set(draft_id, version, format, content)
+    return content
 
 #make a controller for report generation
 async def generate_report_controller(
@@ -28,16 +207,19 @@ async def generate_report_controller(
         format : str = "json"
 ):
     try:
-        report_data = await generate_draft_report_data(db,draft_id,user_id)
+        version = await draft_stats_crud.get_version(db, draft_id, user_id)
+        if version is None:
+            raise ValueError("Draft not found")
+
+        content = await _render_report(db, user_id, draft_id, version, format)
 
-        if format == "html":
-            return generate_html_report(report_data)
+        if format in REPORT_TEMPLATES:
+            return content.decode("utf-8")
         elif format == "pdf":
-            html_content = generate_html_report(report_data)
-            return html_to_pdf(html_content)
+            return content
         else:
-            return report_data 
-    except ValueError as e:
+            return json.loads(content)
+    except (ValueError, PoolSaturated, PoolTimeout) as e:
         raise e
     except Exception as e:
         raise Exception(f"Report generation failed: {str(e)}")
@@ -3,6 +3,7 @@ from pydantic_core.core_schema import FieldValidationInfo
 from pydantic import PostgresDsn, EmailStr, AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Any
+from functools import cache
 import secrets
 from enum import Enum
 
@@ -42,8 +43,90 @@ class Settings(BaseSettings):
             )
         return v
     
-    OPENAI_API_KEY: str
+    # Only needed once an LLM agent is first used
+    OPENAI_API_KEY: str | None = None
+
+    # Re-uploads of a file reuse the earlier draft's text and summary; by default only
+    # the same user's drafts are matched, set DRAFT_DEDUP_GLOBAL to match anyone's
+    DRAFT_DEDUP_GLOBAL: bool = False
+
+    # Draft summarisation; longer drafts are summarised in chunks that are then merged
+    SUMMARY_SINGLE_PASS_MAX_TOKENS: int = 12_000
+    SUMMARY_CHUNK_MAX_TOKENS: int = 4_000
+    SUMMARY_CONCURRENCY: int = 4
+    # Summaries are written in the background; uploads return before they land
+    SUMMARY_JOB_WORKERS: int = 2
+    SUMMARY_JOB_STALE_SECONDS: int = 600
+    SUMMARY_MAX_ATTEMPTS: int = 4
+    SUMMARY_RETRY_BASE_SECONDS: float = 5.0
+    SUMMARY_EVENTS_POLL_SECONDS: float = 1.0
+    SUMMARY_EVENTS_TIMEOUT_SECONDS: float = 600.0
+
+    # Comment ingestion
+    CSV_ANALYSIS_CONCURRENCY: int = 8
+    CSV_INSERT_BATCH_SIZE: int = 100
+    # Comments sent to the analysis agent per request; 1 disables batching
+    ANALYSIS_BATCH_MAX_COMMENTS: int = 20
+    ANALYSIS_BATCH_MAX_TOKENS: int = 2000
+    ANALYSIS_JOB_WORKERS: int = 2
+    ANALYSIS_JOB_STALE_SECONDS: int = 300
+    # Rows fetched per round trip by comment exports
+    COMMENT_EXPORT_BATCH_SIZE: int = 1000
+
+    # Sentiment backend: "llm" or "lexicon" (CPU-only, no network)
+    SENTIMENT_BACKEND: str = "llm"
+    # Switch a request to the lexicon backend once the LLM takes longer; 0 disables
+    SENTIMENT_LLM_TIMEOUT_SECONDS: float = 60.0
+    # Lexicon results at or above this confidence skip the LLM; above 1 disables routing
+    SENTIMENT_LOCAL_CONFIDENCE_THRESHOLD: float = 0.7
+
+    # Sentiment result cache
+    SENTIMENT_CACHE_SIZE: int = 10_000
+    SENTIMENT_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    SENTIMENT_CACHE_PURGE_INTERVAL_SECONDS: int = 6 * 60 * 60
+
+    # bcrypt work factor; hashes made with another one are replaced on the next successful login
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # Password hashing threads; logins beyond PASSWORD_HASH_MAX_PENDING get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+
+    # Authenticated users are cached per process for this long; 0 disables the cache
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Carry the user's identity in the access token so requests skip the users
+    # table; a deleted user then keeps access until the token expires
+    AUTH_TOKEN_CLAIMS: bool = False
+
+    # Rendered report cache; set REPORT_CACHE_DIR to also keep reports on disk
+    REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REPORT_CACHE_DIR: str | None = None
+    # Set to keep compiled report templates on disk across restarts
+    REPORT_TEMPLATE_BYTECODE_DIR: str | None = None
+
+    # PDF rendering process pool
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_MAX_PENDING: int = 8
+    PDF_RENDER_TIMEOUT_SECONDS: float = 60.0
+
+    # Uploads: multipart bodies over UPLOAD_MAX_BYTES are cut off with 413 while
+    # streaming, files over UPLOAD_SPOOL_MAX_MEMORY are spooled to disk
+    UPLOAD_MAX_BYTES: int = 100 * 1024 * 1024
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024
+
+    # PDF text extraction; larger PDFs are split across worker processes by page range
+    PDF_EXTRACT_WORKERS: int = 2
+    PDF_EXTRACT_MAX_PENDING: int = 16
+    PDF_EXTRACT_PAGES_PER_TASK: int = 25
+    PDF_EXTRACT_TIMEOUT_SECONDS: float = 120.0
+    PDF_MAX_PAGES: int = 1000
+    PDF_MAX_TEXT_CHARS: int = 5_000_000
 
     model_config = SettingsConfigDict(case_sensitive=True, env_file="../.env")
 
-settings = Settings()
\ No newline at end of file
+@cache
+def get_settings() -> Settings:
+    return Settings()
+
+settings = get_settings()
\ No newline at end of file
@@ -0,0 +1,44 @@
+from collections import Counter, deque
+
+class Metrics:
+    """
+    Process-local counters and latency samples exposed through the metrics
+    endpoint. Only the most recent `max_samples` observations per name are
+    kept, so percentiles reflect recent behaviour.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self._counters: Counter[str] = Counter()
+        self._samples: dict[str, deque[float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        return self._counters[name]
+
+    def observe(self, name: str, value: float) -> None:
+        if name not in self._samples:
+            self._samples[name] = deque(maxlen=self.max_samples)
+        self._samples[name].append(value)
+
+    def percentile(self, name: str, q: float) -> float | None:
+        samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> dict[str, float]:
+        result: dict[str, float] = dict(self._counters)
+        # Every "<prefix>hits" counter with a matching "<prefix>misses" gets a "<prefix>hit_rate"
+        for name, hits in self._counters.items():
+            if name.endswith("hits") and name[:-4] + "misses" in self._counters:
+                lookups = hits + self._counters[name[:-4] + "misses"]
+                result[name[:-4] + "hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        for name in self._samples:
+            result[f"{name}.p50"] = self.percentile(name, 0.5)
+            result[f"{name}.p95"] = self.percentile(name, 0.95)
+        return dict(sorted(result.items()))
+
+metrics = Metrics()
\ No newline at end of file
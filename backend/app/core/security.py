@@ -1,9 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.utils.worker_pool import WorkerPool
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    # Hashes made with any other work factor count as outdated and are replaced on login
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL while hashing, so threads are enough to keep it
+# off the event loop
+password_pool = WorkerPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+    name="password_pool",
+    busy_message="Too many sign-ins in progress, try again later",
+    timeout_message="Checking the password took too long, try again later",
+    executor_class=ThreadPoolExecutor,
+)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(pwd_context.hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies in the password pool. Also returns a replacement hash when the
+    stored one was made with an outdated work factor, else None.
+    """
+    return await password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
\ No newline at end of file
@@ -1,8 +1,16 @@
+from app.crud.draft_stats_crud import draft_stats_crud
 from app.models.comment_model import Comment
 from app.schemas.comment_schema import CommentCreate
+from datetime import datetime
+from itertools import batched
+from sqlalchemy import insert, tuple_
+from sqlalchemy.ext.asyncio import AsyncResult
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
-from uuid import UUID
+from uuid import UUID, uuid4
+
+# Rows per INSERT statement; keeps bind parameters well under asyncpg's 32767 limit
+INSERT_CHUNK_SIZE = 1000
 
 class CommentCRUD:
     def __init__(self, model):
@@ -15,34 +23,89 @@ class CommentCRUD:
                         sentiment_keywords=obj_in.sentiment_keywords,
                         draft_id=draft_id)
         db.add(db_obj)
+        await draft_stats_crud.record(db, draft_id, [db_obj])
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
-    async def create_many(self, db: AsyncSession, *, objs_in: list[CommentCreate], draft_id: UUID) -> list[Comment]:
-        comments = []
-        for obj_in in objs_in:
-            db_obj = Comment(comment=obj_in.comment, 
-                sentiment_analysis=obj_in.sentiment_analysis,
-                sentiment_score=obj_in.sentiment_score,
-                sentiment_keywords=obj_in.sentiment_keywords,
-                draft_id=draft_id)
-            db.add(db_obj)
-            comments.append(db_obj)
-        await db.commit()
-        for db_obj in comments:
-            await db.refresh(db_obj)
+    async def create_many(
+        self, db: AsyncSession, *, objs_in: list[CommentCreate], draft_id: UUID, commit: bool = True
+    ) -> list[Comment]:
+        """
+        Inserts comments with one multi-row INSERT ... RETURNING per
+        INSERT_CHUNK_SIZE rows, so the created rows come back without a
+        refresh query per comment. The draft's aggregates are updated in the
+        same transaction. With commit=False the caller owns the transaction
+        and commits alongside its own changes.
+        """
+        now = datetime.utcnow()
+        comments: list[Comment] = []
+        for chunk in batched(objs_in, INSERT_CHUNK_SIZE):
+            result = await db.scalars(
+                insert(Comment).returning(Comment),
+                [
+                    {
+                        "id": uuid4(),
+                        "created_at": now,
+                        "comment": obj_in.comment,
+                        "sentiment_analysis": obj_in.sentiment_analysis,
+                        "sentiment_score": obj_in.sentiment_score,
+                        "sentiment_keywords": obj_in.sentiment_keywords,
+                        "draft_id": draft_id,
+                    }
+                    for obj_in in chunk
+                ],
+            )
+            comments.extend(result.all())
+        await draft_stats_crud.record(db, draft_id, objs_in)
+        if commit:
+            await db.commit()
         return comments
 
+    async def remove(self, db: AsyncSession, *, id: UUID) -> Comment | None:
+        db_obj = await db.get(Comment, id)
+        if db_obj:
+            await db.delete(db_obj)
+            await draft_stats_crud.record(db, db_obj.draft_id, [db_obj], sign=-1)
+            await db.commit()
+        return db_obj
+
     async def get_by_draft_id(
-        self, db: AsyncSession, draft_id: UUID, limit: int = 100
+        self,
+        db: AsyncSession,
+        draft_id: UUID,
+        limit: int = 100,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[Comment]:
+        """
+        Newest comments first. `after` is the (created_at, id) of the last
+        comment of the previous page; the page continues right after it.
+        """
+        query = select(Comment).where(Comment.draft_id == draft_id)
+        if after is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) < tuple_(*after))
         result = await db.exec(
-            select(Comment)
-            .where(Comment.draft_id == draft_id)
-            .limit(limit)
-            .order_by(Comment.created_at.desc())
+            query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit)
         )
         return result.all()
 
+    async def stream_by_draft_id(self, db: AsyncSession, draft_id: UUID, batch_size: int = 1000) -> AsyncResult:
+        """
+        Every comment of a draft, oldest first, as plain rows fetched through
+        a server-side cursor `batch_size` at a time.
+        """
+        return await db.stream(
+            select(
+                Comment.id,
+                Comment.created_at,
+                Comment.comment,
+                Comment.sentiment_analysis,
+                Comment.sentiment_score,
+                Comment.sentiment_keywords,
+            )
+            .where(Comment.draft_id == draft_id)
+            .order_by(Comment.created_at, Comment.id)
+            .execution_options(yield_per=batch_size)
+        )
+
 comment_crud = CommentCRUD(Comment)
\ No newline at end of file
@@ -1,43 +1,111 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import defer
 from sqlmodel import select
 from uuid import UUID
-from app.models.draft_model import Draft
+from app.models.draft_model import Draft, DraftAnalytics
+from app.models.draft_stats_model import DraftStats
+from app.models.enums import JobStatus
 from app.schemas.draft_schema import DraftCreate
 
+# Characters of the summary shown in draft listings
+SUMMARY_EXCERPT_LENGTH = 280
+
 class DraftCRUD:
     def __init__(self, model):
         self.model = model
 
-    async def create(self, db: AsyncSession, *, obj_in: DraftCreate, user_id: UUID) -> Draft:
-        db_obj = Draft(draft=obj_in.draft, summary=obj_in.summary, user_id=user_id)
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: DraftCreate,
+        user_id: UUID,
+        analytics: DraftAnalytics | None = None,
+        content_hash: str | None = None,
+        page_offsets: list[int] | None = None,
+    ) -> Draft:
+        db_obj = Draft(
+            draft=obj_in.draft,
+            summary=obj_in.summary,
+            user_id=user_id,
+            content_hash=content_hash,
+            page_offsets=page_offsets,
+            summary_status=(JobStatus.DONE if obj_in.summary is not None else JobStatus.PENDING).value,
+            **(analytics.model_dump() if analytics else {}),
+        )
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
-    async def get(self, db: AsyncSession, id: UUID, user_id: UUID) -> Draft | None:
-        result = await db.exec(
-            select(Draft).where(Draft.id == id, Draft.user_id == user_id)
+    async def get(self, db: AsyncSession, id: UUID, user_id: UUID, with_text: bool = True) -> Draft | None:
+        """
+        With `with_text=False` the draft's text and page offsets are not
+        loaded, and must not be accessed on the returned object.
+        """
+        query = select(Draft).where(Draft.id == id, Draft.user_id == user_id)
+        if not with_text:
+            query = query.options(defer(Draft.draft), defer(Draft.page_offsets))
+        result = await db.exec(query)
+        return result.first()
+
+    async def get_text(
+        self, db: AsyncSession, id: UUID, user_id: UUID, offset: int = 0, length: int | None = None
+    ) -> tuple[str, int] | None:
+        """
+        A slice of the draft's text, cut in the database so only the slice
+        is transferred, together with the text's full length.
+        """
+        # substr counts from 1
+        text = func.substr(Draft.draft, offset + 1)
+        if length is not None:
+            text = func.substr(Draft.draft, offset + 1, length)
+        result = await db.execute(
+            select(text, func.char_length(Draft.draft))
+            .where(Draft.id == id, Draft.user_id == user_id)
         )
         return result.first()
 
     async def remove(self, db: AsyncSession, id: UUID, user_id: UUID) -> Draft | None:
-        obj = await self.get(db, id, user_id)
+        obj = await self.get(db, id, user_id, with_text=False)
         if obj:
             await db.delete(obj)
             await db.commit()
         return obj
     
     async def get_drafts_by_user(
-        self, db: AsyncSession, user_id: UUID, limit: int = 100
-    ):
-        result = await db.exec(
-            select(self.model)
-            .where(self.model.user_id == user_id)
-            .limit(limit)
-            .order_by(self.model.created_at.desc())
-        )
-        return result.all()
+        self, db: AsyncSession, user_id: UUID, limit: int = 100, with_stats: bool = False
+    ) -> list[dict]:
+        """
+        Newest drafts first, as a column-only projection that never reads
+        the text column; see DraftListItem. With `with_stats` each draft's
+        comment count and sentiment mix are joined in from draft_stats in
+        the same query.
+        """
+        columns = [
+            self.model.id,
+            func.left(self.model.summary, SUMMARY_EXCERPT_LENGTH).label("summary_excerpt"),
+            self.model.summary_status,
+            self.model.created_at,
+            self.model.word_count,
+            self.model.character_count,
+        ]
+        if with_stats:
+            # Drafts without comments have no draft_stats row yet
+            columns += [
+                func.coalesce(DraftStats.comment_count, 0).label("comment_count"),
+                func.coalesce(DraftStats.positive_count, 0).label("positive_count"),
+                func.coalesce(DraftStats.negative_count, 0).label("negative_count"),
+                func.coalesce(DraftStats.neutral_count, 0).label("neutral_count"),
+            ]
+        query = select(*columns).where(self.model.user_id == user_id)
+        if with_stats:
+            query = query.outerjoin(DraftStats, DraftStats.draft_id == self.model.id)
+
+        result = await db.execute(query.order_by(self.model.created_at.desc()).limit(limit))
+        return [dict(row) for row in result.mappings()]
     
     async def get_draft_summary(
             self, db:AsyncSession, user_id: UUID, draft_id: UUID 
@@ -48,4 +116,104 @@ class DraftCRUD:
         )
         return result.first()
 
+    async def get_by_content_hash(
+        self, db: AsyncSession, content_hash: str, user_id: UUID | None = None
+    ) -> Draft | None:
+        """
+        The latest draft uploaded with this hash, by `user_id` if given,
+        preferring one whose summary is done.
+        """
+        query = select(self.model).where(
+            self.model.content_hash == content_hash,
+            self.model.summary_status != JobStatus.FAILED.value,
+        )
+        if user_id is not None:
+            query = query.where(self.model.user_id == user_id)
+        result = await db.exec(
+            query.order_by(
+                (self.model.summary_status == JobStatus.DONE.value).desc(),
+                self.model.created_at.desc(),
+            ).limit(1)
+        )
+        return result.first()
+
+    async def set_analytics(self, db: AsyncSession, id: UUID, analytics: DraftAnalytics) -> None:
+        await db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**analytics.model_dump())
+        )
+        await db.commit()
+
+    def _summary_claimable(self, stale_after: timedelta):
+        return or_(
+            Draft.summary_status == JobStatus.PENDING.value,
+            and_(
+                Draft.summary_status == JobStatus.RUNNING.value,
+                or_(
+                    Draft.summary_started_at.is_(None),
+                    Draft.summary_started_at < datetime.utcnow() - stale_after,
+                ),
+            ),
+        )
+
+    async def claim_summary(self, db: AsyncSession, id: UUID, stale_after: timedelta) -> Draft | None:
+        """
+        Atomically marks a draft's summary as running. Returns None when it is
+        already done or failed, or another worker is currently on it.
+        """
+        result = await db.execute(
+            update(Draft)
+            .where(Draft.id == id, self._summary_claimable(stale_after))
+            .values(summary_status=JobStatus.RUNNING.value, summary_started_at=datetime.utcnow())
+            .returning(Draft.id)
+        )
+        claimed = result.first() is not None
+        await db.commit()
+        if not claimed:
+            return None
+        return await db.get(Draft, id, populate_existing=True)
+
+    async def touch_summary(self, db: AsyncSession, id: UUID) -> None:
+        """Refreshes a running summary's claim so it isn't taken for stale."""
+        await db.execute(
+            update(Draft)
+            .where(Draft.id == id, Draft.summary_status == JobStatus.RUNNING.value)
+            .values(summary_started_at=datetime.utcnow())
+        )
+        await db.commit()
+
+    async def get_pending_summary_ids(self, db: AsyncSession, stale_after: timedelta) -> list[UUID]:
+        result = await db.exec(
+            select(Draft.id)
+            .where(self._summary_claimable(stale_after))
+            .order_by(Draft.created_at)
+        )
+        return result.all()
+
+    async def record_summary_failure(self, db: AsyncSession, id: UUID, error: str) -> int:
+        """Counts a failed attempt, refreshing the claim; returns the attempts so far."""
+        result = await db.execute(
+            update(Draft)
+            .where(Draft.id == id)
+            .values(
+                summary_attempts=Draft.summary_attempts + 1,
+                summary_error=error,
+                summary_started_at=datetime.utcnow(),
+            )
+            .returning(Draft.summary_attempts)
+        )
+        attempts = result.scalar_one()
+        await db.commit()
+        return attempts
+
+    async def finish_summary(
+        self, db: AsyncSession, id: UUID, status: JobStatus, summary: str | None = None, error: str | None = None
+    ) -> None:
+        values = {"summary_status": status.value, "summary_error": error}
+        if summary is not None:
+            values["summary"] = summary
+        await db.execute(update(Draft).where(Draft.id == id).values(**values))
+        await db.commit()
+
 draft_crud = DraftCRUD(Draft)
\ No newline at end of file
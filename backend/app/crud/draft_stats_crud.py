@@ -0,0 +1,130 @@
+from collections.abc import Iterable
+from datetime import datetime
+from sqlalchemy import exists, func, literal, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+from uuid import UUID
+
+from app.models.comment_model import Comment
+from app.models.draft_model import Draft
+from app.models.draft_stats_model import DraftStats
+from app.utils.sentiment_stats import aggregate_sentiments, aggregate_sentiments_sql
+
+class DraftStatsCRUD:
+    def __init__(self, model):
+        self.model = model
+
+    async def get(self, db: AsyncSession, draft_id: UUID) -> DraftStats:
+        """Returns the stored aggregates, or empty ones for a draft with no comments."""
+        stats = await db.get(DraftStats, draft_id)
+        return stats or DraftStats(draft_id=draft_id)
+
+    async def record(self, db: AsyncSession, draft_id: UUID, comments: Iterable, sign: int = 1) -> None:
+        """
+        Adds (sign=1) or subtracts (sign=-1) comments from the draft's
+        aggregates. Does not commit: callers run it in the same transaction
+        as the comment insert or delete it accounts for.
+        """
+        totals = aggregate_sentiments(
+            (comment.sentiment_analysis, comment.sentiment_score) for comment in comments
+        )
+        if not totals["comment_count"]:
+            return
+        delta = {column: sign * value for column, value in totals.items()}
+        statement = insert(DraftStats).values(
+            draft_id=draft_id, version=1, updated_at=datetime.utcnow(), **delta
+        )
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DraftStats.draft_id],
+                set_={
+                    **{column: getattr(DraftStats, column) + value for column, value in delta.items()},
+                    "version": DraftStats.version + 1,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
+
+    async def compute(self, db: AsyncSession, draft_id: UUID) -> DraftStats:
+        """
+        Aggregates a draft's comments inside Postgres, without loading any
+        comment rows, and returns the totals without storing them.
+        """
+        columns = aggregate_sentiments_sql(Comment.sentiment_analysis, Comment.sentiment_score)
+        result = await db.exec(
+            select(*(column.label(name) for name, column in columns.items()))
+            .where(Comment.draft_id == draft_id)
+        )
+        return DraftStats(draft_id=draft_id, **result.one()._asdict())
+
+    async def rebuild(self, db: AsyncSession, draft_id: UUID) -> None:
+        """
+        Recomputes a draft's aggregates from its comments, repairing any
+        drift in the incrementally maintained values.
+        """
+        stats = await self.compute(db, draft_id)
+        totals = stats.model_dump(exclude={"draft_id", "version", "updated_at"})
+        statement = insert(DraftStats).values(
+            draft_id=draft_id, version=1, updated_at=datetime.utcnow(), **totals
+        )
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DraftStats.draft_id],
+                set_={
+                    **{column: getattr(statement.excluded, column) for column in [*totals, "updated_at"]},
+                    "version": DraftStats.version + 1,
+                },
+            )
+        )
+        await db.commit()
+
+    async def rebuild_all(self, db: AsyncSession) -> int:
+        """
+        Replaces every draft's aggregates with one grouped query over
+        comments. Returns the number of drafts that have comments.
+        """
+        columns = aggregate_sentiments_sql(Comment.sentiment_analysis, Comment.sentiment_score)
+        statement = insert(DraftStats).from_select(
+            ["draft_id", *columns, "version", "updated_at"],
+            select(Comment.draft_id, *columns.values(), literal(1), func.now()).group_by(Comment.draft_id),
+        )
+        result = await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DraftStats.draft_id],
+                set_={
+                    **{column: getattr(statement.excluded, column) for column in [*columns, "updated_at"]},
+                    "version": DraftStats.version + 1,
+                },
+            )
+        )
+        # Drafts whose comments are all gone keep a row; zero it out
+        await db.execute(
+            update(DraftStats)
+            .where(~exists().where(Comment.draft_id == DraftStats.draft_id))
+            .values(
+                **{column: 0 for column in columns},
+                version=DraftStats.version + 1,
+                updated_at=func.now(),
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def get_version(self, db: AsyncSession, draft_id: UUID, user_id: UUID) -> str | None:
+        """
+        Returns a token that changes whenever the draft or its comments do,
+        or None when the user has no such draft. Costs one indexed lookup.
+        """
+        result = await db.exec(
+            select(Draft.updated_at, DraftStats.version)
+            .outerjoin(DraftStats, DraftStats.draft_id == Draft.id)
+            .where(Draft.id == draft_id, Draft.user_id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        updated_at, version = row
+        return f"{version or 0}-{int(updated_at.timestamp() * 1_000_000) if updated_at else 0}"
+
+draft_stats_crud = DraftStatsCRUD(DraftStats)
\ No newline at end of file
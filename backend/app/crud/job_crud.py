@@ -0,0 +1,151 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from itertools import batched
+from sqlalchemy import and_, func, insert, or_, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+from uuid import UUID
+
+from app.models.comment_model import Comment
+from app.models.enums import JobStatus, JobRowStatus
+from app.models.job_model import AnalysisJob, AnalysisJobRow
+
+class AnalysisJobCRUD:
+    def __init__(self, model):
+        self.model = model
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        draft_id: UUID,
+        user_id: UUID,
+        comments: Iterable[str],
+        chunk_size: int = 1000,
+    ) -> AnalysisJob:
+        """
+        Persists a job together with its input rows. Rows are inserted in
+        chunks as `comments` is consumed, so the input is never fully buffered.
+        """
+        db_obj = AnalysisJob(draft_id=draft_id, user_id=user_id)
+        db.add(db_obj)
+        await db.flush()
+
+        total = 0
+        for chunk in batched(comments, chunk_size):
+            await db.execute(
+                insert(AnalysisJobRow),
+                [
+                    {"job_id": db_obj.id, "row_index": total + i, "comment": comment}
+                    for i, comment in enumerate(chunk)
+                ],
+            )
+            total += len(chunk)
+
+        db_obj.total_rows = total
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def get(self, db: AsyncSession, id: UUID, user_id: UUID) -> AnalysisJob | None:
+        result = await db.exec(
+            select(AnalysisJob).where(AnalysisJob.id == id, AnalysisJob.user_id == user_id)
+        )
+        return result.first()
+
+    async def remove(self, db: AsyncSession, db_obj: AnalysisJob) -> None:
+        await db.delete(db_obj)
+        await db.commit()
+
+    def _claimable(self, stale_after: timedelta):
+        return or_(
+            AnalysisJob.status == JobStatus.PENDING.value,
+            and_(
+                AnalysisJob.status == JobStatus.RUNNING.value,
+                or_(
+                    AnalysisJob.heartbeat_at.is_(None),
+                    AnalysisJob.heartbeat_at < datetime.utcnow() - stale_after,
+                ),
+            ),
+        )
+
+    async def claim(self, db: AsyncSession, id: UUID, stale_after: timedelta) -> AnalysisJob | None:
+        """
+        Atomically marks a pending (or abandoned) job as running. Returns None
+        when the job is finished or another worker currently owns it.
+        """
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == id, self._claimable(stale_after))
+            .values(
+                status=JobStatus.RUNNING.value,
+                heartbeat_at=now,
+                started_at=func.coalesce(AnalysisJob.started_at, now),
+            )
+            .returning(AnalysisJob.id)
+        )
+        claimed = result.first() is not None
+        await db.commit()
+        if not claimed:
+            return None
+        return await db.get(AnalysisJob, id, populate_existing=True)
+
+    async def get_resumable_ids(self, db: AsyncSession, stale_after: timedelta) -> list[UUID]:
+        result = await db.exec(
+            select(AnalysisJob.id)
+            .where(self._claimable(stale_after))
+            .order_by(AnalysisJob.created_at)
+        )
+        return result.all()
+
+    async def get_pending_rows(self, db: AsyncSession, job_id: UUID, limit: int) -> list[AnalysisJobRow]:
+        result = await db.exec(
+            select(AnalysisJobRow)
+            .where(
+                AnalysisJobRow.job_id == job_id,
+                AnalysisJobRow.status == JobRowStatus.PENDING.value,
+            )
+            .order_by(AnalysisJobRow.row_index)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def record_progress(self, db: AsyncSession, job_id: UUID, *, done: int, failed: int) -> None:
+        """
+        Bumps the job counters and heartbeat, committing them together with
+        whatever row and comment changes are pending in the session.
+        """
+        await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id)
+            .values(
+                processed_rows=AnalysisJob.processed_rows + done,
+                failed_rows=AnalysisJob.failed_rows + failed,
+                heartbeat_at=datetime.utcnow(),
+            )
+        )
+        await db.commit()
+
+    async def finish(self, db: AsyncSession, job_id: UUID, status: JobStatus, error: str | None = None) -> None:
+        await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id)
+            .values(status=status.value, error=error, finished_at=datetime.utcnow())
+        )
+        await db.commit()
+
+    async def get_results(
+        self, db: AsyncSession, job_id: UUID, limit: int = 100, offset: int = 0
+    ) -> list[Comment]:
+        result = await db.exec(
+            select(Comment)
+            .join(AnalysisJobRow, AnalysisJobRow.comment_id == Comment.id)
+            .where(AnalysisJobRow.job_id == job_id)
+            .order_by(AnalysisJobRow.row_index)
+            .offset(offset)
+            .limit(limit)
+        )
+        return result.all()
+
+analysis_job_crud = AnalysisJobCRUD(AnalysisJob)
\ No newline at end of file
@@ -1,9 +1,12 @@
+from uuid import UUID
+
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, UserUpdate
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.crud.base_crud import CRUDBase
+from app.utils.user_cache import user_cache
 
 class UserCRUD(CRUDBase[User, UserCreate, UserUpdate]):
     async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
@@ -14,7 +17,7 @@ class UserCRUD(CRUDBase[User, UserCreate, UserUpdate]):
         db_obj = User(
             username=obj_in.username,
             email=obj_in.email,
-            hashed_password=hash_password(obj_in.password),
+            hashed_password=await hash_password_async(obj_in.password),
         )
         db.add(db_obj)
         try:
@@ -25,4 +28,16 @@ class UserCRUD(CRUDBase[User, UserCreate, UserUpdate]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate | dict
+    ) -> User:
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        user_cache.invalidate(user.id)
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: UUID) -> User:
+        user = await super().remove(db, id=id)
+        user_cache.invalidate(id)
+        return user
+
 user_crud = UserCRUD(User)
\ No newline at end of file
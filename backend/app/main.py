@@ -1,20 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import router
 from app.core.config import settings
+from app.core.security import password_pool
+from app.controllers.comment import analysis_job_runner
+from app.controllers.draft import summary_job_runner
+from app.utils.sentiment_cache import sentiment_cache
+from app.utils.render_pool import render_pool
+from app.utils.pdf_extractor import pdf_extract_pool
+from app.utils.uploads import UploadSizeLimitMiddleware, configure_upload_spooling
+from app.utils.report_templates import warm_templates
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uploaded files above this size are spooled to a temp file instead of kept in memory
+    configure_upload_spooling(settings.UPLOAD_SPOOL_MAX_MEMORY)
+    await analysis_job_runner.start()
+    await summary_job_runner.start()
+    purge_task = asyncio.create_task(
+        sentiment_cache.purge_periodically(settings.SENTIMENT_CACHE_PURGE_INTERVAL_SECONDS)
+    )
+    warm_templates()
+    yield
+    await analysis_job_runner.stop()
+    await summary_job_runner.stop()
+    purge_task.cancel()
+    render_pool.shutdown()
+    pdf_extract_pool.shutdown()
+    password_pool.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=settings.UPLOAD_MAX_BYTES)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let scripts read non-safelisted response headers listed here
+    expose_headers=["X-Next-Cursor", "X-Text-Length", "X-Next-Offset"],
 )
 
 # Routers
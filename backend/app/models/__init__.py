@@ -1,3 +1,7 @@
 from .user_model import User
 from .draft_model import Draft
-from .comment_model import Comment
\ No newline at end of file
+from .comment_model import Comment
+from .job_model import AnalysisJob, AnalysisJobRow
+from .sentiment_cache_model import SentimentCacheEntry
+from .draft_stats_model import DraftStats
+from .summary_chunk_model import SummaryChunk
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from uuid import UUID
 
@@ -10,11 +11,13 @@ if TYPE_CHECKING:
 class CommentBase(SQLModel):
     comment: str
     sentiment_analysis: str = Field(default=None, nullable=True)
-    sentiment_score: str = Field(default=None, nullable=True)
+    sentiment_score: float = Field(default=None, nullable=True)
     sentiment_keywords: str = Field(default=None, nullable=True)
 
 class Comment(BaseUUIDModel, CommentBase, table=True):
     __tablename__ = "comments"
+    # Keyset pagination and exports walk a draft's comments in (created_at, id) order
+    __table_args__ = (Index("ix_comments_draft_id_created_at_id", "draft_id", "created_at", "id"),)
 
     draft_id: UUID = Field(foreign_key="drafts.id", index=True)
     draft: "Draft" = Relationship(back_populates="comments")
\ No newline at end of file
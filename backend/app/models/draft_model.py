@@ -1,8 +1,11 @@
 from typing import TYPE_CHECKING
+from sqlalchemy import JSON, Column
 from sqlmodel import SQLModel, Field, Relationship
 from uuid import UUID
+from datetime import datetime
  
 from .base_model import BaseUUIDModel
+from .enums import JobStatus
 
 if TYPE_CHECKING:
     from .user_model import User
@@ -12,9 +15,28 @@ class DraftBase(SQLModel):
     draft: str
     summary: str | None = Field(default=None, nullable=True)
 
-class Draft(BaseUUIDModel, DraftBase, table=True):
+class DraftAnalytics(SQLModel):
+    # Computed once at upload, see app.utils.text_analytics; null until backfilled
+    word_count: int | None = Field(default=None, nullable=True)
+    character_count: int | None = Field(default=None, nullable=True)
+    sentence_count: int | None = Field(default=None, nullable=True)
+    avg_words_per_sentence: float | None = Field(default=None, nullable=True)
+    readability_score: float | None = Field(default=None, nullable=True)
+    readability_level: str | None = Field(default=None, nullable=True)
+    readability_grade_level: float | None = Field(default=None, nullable=True)
+
+class Draft(BaseUUIDModel, DraftBase, DraftAnalytics, table=True):
     __tablename__ = "drafts"
 
     user_id: UUID = Field(foreign_key="users.id", index=True)
+    # sha256 of the uploaded file, used to reuse the text and summary of a re-upload
+    content_hash: str | None = Field(default=None, index=True, nullable=True)
+    # The summary is written by a background worker, see app.controllers.draft
+    summary_status: str = Field(default=JobStatus.PENDING.value, index=True)
+    summary_attempts: int = Field(default=0)
+    summary_error: str | None = Field(default=None, nullable=True)
+    summary_started_at: datetime | None = Field(default=None, nullable=True)
+    # Where each page after the first starts in `draft`, so the summariser can chunk by page
+    page_offsets: list[int] | None = Field(default=None, sa_column=Column(JSON, nullable=True))
     user: "User" = Relationship(back_populates="drafts")
     comments: "Comment" = Relationship(back_populates="draft", sa_relationship_kwargs={"cascade": "all, delete"})
\ No newline at end of file
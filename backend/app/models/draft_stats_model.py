@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+
+class DraftStats(SQLModel, table=True):
+    __tablename__ = "draft_stats"
+
+    draft_id: UUID = Field(foreign_key="drafts.id", primary_key=True, ondelete="CASCADE")
+    comment_count: int = Field(default=0)
+    # Sums over scores normalised to -1..1, see app.utils.sentiment_stats
+    score_sum: float = Field(default=0.0)
+    score_sum_sq: float = Field(default=0.0)
+    positive_count: int = Field(default=0)
+    negative_count: int = Field(default=0)
+    neutral_count: int = Field(default=0)
+    # Bumped on every change, so cached reports can tell they are stale
+    version: int = Field(default=0)
+    updated_at: datetime | None = Field(default=None, nullable=True)
\ No newline at end of file
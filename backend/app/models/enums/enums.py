@@ -14,3 +14,13 @@ class KanbanType(str, Enum):
     URGENT = "urgent"
     TASK = "task"
 
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class JobRowStatus(str, Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
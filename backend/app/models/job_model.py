@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+
+from .base_model import BaseUUIDModel
+from .enums import JobStatus, JobRowStatus
+
+class AnalysisJob(BaseUUIDModel, table=True):
+    __tablename__ = "analysis_jobs"
+
+    draft_id: UUID = Field(foreign_key="drafts.id", index=True, ondelete="CASCADE")
+    user_id: UUID = Field(foreign_key="users.id", index=True, ondelete="CASCADE")
+    status: str = Field(default=JobStatus.PENDING.value, index=True)
+    total_rows: int = Field(default=0)
+    processed_rows: int = Field(default=0)
+    failed_rows: int = Field(default=0)
+    error: str | None = Field(default=None, nullable=True)
+    started_at: datetime | None = Field(default=None, nullable=True)
+    finished_at: datetime | None = Field(default=None, nullable=True)
+    # Bumped by the worker after every chunk; a stale value means the worker died
+    heartbeat_at: datetime | None = Field(default=None, nullable=True)
+
+class AnalysisJobRow(SQLModel, table=True):
+    __tablename__ = "analysis_job_rows"
+
+    job_id: UUID = Field(foreign_key="analysis_jobs.id", primary_key=True, ondelete="CASCADE")
+    row_index: int = Field(primary_key=True)
+    comment: str
+    status: str = Field(default=JobRowStatus.PENDING.value)
+    comment_id: UUID | None = Field(default=None, foreign_key="comments.id", nullable=True, ondelete="SET NULL")
+    error: str | None = Field(default=None, nullable=True)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlmodel import SQLModel, Field
+
+class SentimentCacheEntry(SQLModel, table=True):
+    __tablename__ = "sentiment_cache"
+
+    key: str = Field(primary_key=True)
+    sentiment_analysis: str | None = Field(default=None, nullable=True)
+    sentiment_score: float | None = Field(default=None, nullable=True)
+    sentiment_keywords: str | None = Field(default=None, nullable=True)
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        index=True,
+        sa_column_kwargs={"server_default": func.now()}
+    )
\ No newline at end of file
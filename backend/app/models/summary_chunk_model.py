@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlmodel import SQLModel, Field
+
+class SummaryChunk(SQLModel, table=True):
+    __tablename__ = "summary_chunks"
+
+    # See app.utils.summariser.summary_key
+    key: str = Field(primary_key=True)
+    summary: str
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()}
+    )
@@ -4,13 +4,13 @@ from uuid import UUID
 class CommentCreate(BaseModel):
     comment: str
     sentiment_analysis: str | None = None
-    sentiment_score: str | None = None
+    sentiment_score: float | None = None
     sentiment_keywords: str | None = None
 
 class CommentRead(BaseModel):
     id: UUID
     comment: str
     sentiment_analysis: str | None
-    sentiment_score: str | None
+    sentiment_score: float | None
     sentiment_keywords: str | None
     draft_id: UUID
\ No newline at end of file
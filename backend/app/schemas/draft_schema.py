@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from uuid import UUID
+from datetime import datetime
 
 class DraftCreate(BaseModel):
     draft: str
@@ -7,6 +8,21 @@ class DraftCreate(BaseModel):
 
 class DraftRead(BaseModel):
     id: UUID
-    draft: str
+    draft: str | None = None
     summary: str | None = None
-    user_id: UUID
\ No newline at end of file
+    summary_status: str
+    summary_error: str | None = None
+    user_id: UUID
+
+class DraftListItem(BaseModel):
+    id: UUID
+    summary_excerpt: str | None = None
+    summary_status: str
+    created_at: datetime
+    word_count: int | None = None
+    character_count: int | None = None
+    # Only filled in when the listing is requested with include_stats
+    comment_count: int | None = None
+    positive_count: int | None = None
+    negative_count: int | None = None
+    neutral_count: int | None = None
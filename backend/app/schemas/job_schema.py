@@ -0,0 +1,16 @@
+from datetime import datetime
+from pydantic import BaseModel
+from uuid import UUID
+
+class AnalysisJobRead(BaseModel):
+    id: UUID
+    draft_id: UUID
+    status: str
+    total_rows: int
+    processed_rows: int
+    failed_rows: int
+    rows_per_second: float | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
\ No newline at end of file
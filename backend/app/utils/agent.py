@@ -1,54 +1,208 @@
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIChatModel, OpenAIModelName
-from pydantic_ai.providers.openai import OpenAIProvider
 from app.core.config import settings
+from app.core.metrics import metrics
+from typing import TYPE_CHECKING, TypeVar
+import asyncio
+import json
+import logging
 import os
 
+# pydantic_ai pulls in the OpenAI client and friends, so it is only imported
+# once an agent is first needed rather than at startup
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.models.openai import OpenAIChatModel, OpenAIModelName
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+logger = logging.getLogger(__name__)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SUMMARY_PROMPT_PATH = os.path.join(BASE_DIR, "../prompts/draft_summary.md")
 ANALYSIS_PROMPT_PATH = os.path.join(BASE_DIR, "../prompts/sentiment_analysis.md")
+BATCH_ANALYSIS_PROMPT_PATH = os.path.join(BASE_DIR, "../prompts/batch_sentiment_analysis.md")
+CHUNK_SUMMARY_PROMPT_PATH = os.path.join(BASE_DIR, "../prompts/draft_chunk_summary.md")
+SUMMARY_REDUCE_PROMPT_PATH = os.path.join(BASE_DIR, "../prompts/draft_summary_reduce.md")
 
 def load_prompt(path: str) -> str:
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
 
-# Load prompts from files
-summary_instructions = load_prompt(SUMMARY_PROMPT_PATH)
-analysis_instructions = load_prompt(ANALYSIS_PROMPT_PATH)
+# Prompts, read from disk on first use
+@cache
+def get_summary_instructions() -> str:
+    return load_prompt(SUMMARY_PROMPT_PATH)
+
+@cache
+def get_chunk_summary_instructions() -> str:
+    return get_summary_instructions() + "\n\n" + load_prompt(CHUNK_SUMMARY_PROMPT_PATH)
+
+@cache
+def get_summary_reduce_instructions() -> str:
+    return get_summary_instructions() + "\n\n" + load_prompt(SUMMARY_REDUCE_PROMPT_PATH)
+
+@cache
+def get_analysis_instructions() -> str:
+    return load_prompt(ANALYSIS_PROMPT_PATH)
+
+@cache
+def get_batch_analysis_instructions() -> str:
+    return get_analysis_instructions() + "\n\n" + load_prompt(BATCH_ANALYSIS_PROMPT_PATH)
 
 # Model names
-SUMMARY_MODEL_NAME: OpenAIModelName = "gpt-4.1"
-ANALYSIS_MODEL_NAME: OpenAIModelName = "gpt-5-nano"
+SUMMARY_MODEL_NAME: "OpenAIModelName" = "gpt-4.1"
+ANALYSIS_MODEL_NAME: "OpenAIModelName" = "gpt-5-nano"
 
-# Provider
-openai_provider = OpenAIProvider(api_key=settings.OPENAI_API_KEY)
+# Provider and models, built on first use so importing the app needs no API key
+@cache
+def get_openai_provider() -> "OpenAIProvider":
+    from pydantic_ai.providers.openai import OpenAIProvider
+    return OpenAIProvider(api_key=settings.OPENAI_API_KEY)
 
-# Models
-summary_model = OpenAIChatModel(
-    SUMMARY_MODEL_NAME,
-    provider=openai_provider,
-)
+@cache
+def get_summary_model() -> "OpenAIChatModel":
+    from pydantic_ai.models.openai import OpenAIChatModel
+    return OpenAIChatModel(
+        SUMMARY_MODEL_NAME,
+        provider=get_openai_provider(),
+    )
 
-analysis_model = OpenAIChatModel(
-    model_name=ANALYSIS_MODEL_NAME,
-    provider=openai_provider
-)
+@cache
+def get_analysis_model() -> "OpenAIChatModel":
+    from pydantic_ai.models.openai import OpenAIChatModel
+    return OpenAIChatModel(
+        model_name=ANALYSIS_MODEL_NAME,
+        provider=get_openai_provider()
+    )
 
 # Output schema for analysis agent
 class Sentiment(BaseModel):
     sentiment_analysis: str = Field(description="Given a comment you are to classify it as: [positive, neutral, negative]")
-    sentiment_score: str = Field(description="Given a comment you are to assign it a numeric value scaling positive to 1 and negative to 0")
+    sentiment_score: float = Field(description="Given a comment you are to assign it a numeric value scaling positive to 1 and negative to 0")
     sentiment_keywords: str = Field(description="Given a comment you are to analyse and list out keywords which heavily impact the sentiment of the sentence")
 
+class BatchSentiment(Sentiment):
+    id: int = Field(description="The id of the comment this result belongs to")
+
 # Agents
-summary_agent = Agent(
-    summary_model,
-    instructions=summary_instructions
-)
-
-analysis_agent = Agent(
-    analysis_model,
-    instructions=analysis_instructions,
-    output_type=Sentiment
-)
+@cache
+def get_summary_agent() -> "Agent":
+    from pydantic_ai import Agent
+    return Agent(
+        get_summary_model(),
+        instructions=get_summary_instructions()
+    )
+
+@cache
+def get_chunk_summary_agent() -> "Agent":
+    from pydantic_ai import Agent
+    return Agent(
+        get_summary_model(),
+        instructions=get_chunk_summary_instructions()
+    )
+
+@cache
+def get_summary_reduce_agent() -> "Agent":
+    from pydantic_ai import Agent
+    return Agent(
+        get_summary_model(),
+        instructions=get_summary_reduce_instructions()
+    )
+
+@cache
+def get_analysis_agent() -> "Agent":
+    from pydantic_ai import Agent
+    return Agent(
+        get_analysis_model(),
+        instructions=get_analysis_instructions(),
+        output_type=Sentiment
+    )
+
+@cache
+def get_batch_analysis_agent() -> "Agent":
+    from pydantic_ai import Agent
+    return Agent(
+        get_analysis_model(),
+        instructions=get_batch_analysis_instructions(),
+        output_type=list[BatchSentiment]
+    )
+
+# Batched analysis
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+
+T = TypeVar("T")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for batch budgeting."""
+    return len(text) // 4 + 1
+
+def batch_comments(
+    items: Iterable[T],
+    *,
+    max_items: int,
+    max_tokens: int,
+    text: Callable[[T], str] = lambda item: item,
+) -> Iterator[list[T]]:
+    """
+    Groups items into batches of at most `max_items` whose comments fit in
+    `max_tokens`. A single comment over the budget gets a batch of its own.
+    """
+    batch: list[T] = []
+    tokens = 0
+    for item in items:
+        item_tokens = estimate_tokens(text(item))
+        if batch and (len(batch) >= max_items or tokens + item_tokens > max_tokens):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(item)
+        tokens += item_tokens
+    if batch:
+        yield batch
+
+def _is_valid_sentiment(sentiment: Sentiment) -> bool:
+    if (sentiment.sentiment_analysis or "").strip().lower() not in SENTIMENT_LABELS:
+        return False
+    return 0 <= sentiment.sentiment_score <= 1
+
+# Shared by every batch, so a run of malformed batches can't fan out into
+# more concurrent single requests than the CSV analysis itself is allowed
+_fallback_semaphore = asyncio.Semaphore(settings.CSV_ANALYSIS_CONCURRENCY)
+
+async def analyse_batch(comments: list[str]) -> list[Sentiment]:
+    """
+    Analyses several comments in one request to the batch analysis agent and
+    returns their sentiments in input order. Comments whose result is
+    missing, duplicated or malformed are re-analysed one by one.
+    """
+    if len(comments) == 1:
+        return [(await get_analysis_agent().run(comments[0])).output]
+
+    prompt = "\n".join(
+        json.dumps({"id": i, "comment": comment}, ensure_ascii=False)
+        for i, comment in enumerate(comments)
+    )
+    results: dict[int, Sentiment] = {}
+    try:
+        batch = await get_batch_analysis_agent().run(prompt)
+        metrics.increment("analysis.batch_requests")
+        for item in batch.output:
+            if 0 <= item.id < len(comments) and item.id not in results and _is_valid_sentiment(item):
+                results[item.id] = Sentiment(**item.model_dump(exclude={"id"}))
+    except Exception:
+        logger.warning("Batch analysis of %d comments failed", len(comments), exc_info=True)
+        metrics.increment("analysis.batch_failures")
+
+    missing = [i for i in range(len(comments)) if i not in results]
+    if missing:
+        metrics.increment("analysis.batch_fallbacks", len(missing))
+        analysis_agent = get_analysis_agent()
+
+        async def analyse_single(comment: str) -> Sentiment:
+            async with _fallback_semaphore:
+                return (await analysis_agent.run(comment)).output
+
+        singles = await asyncio.gather(*(analyse_single(comments[i]) for i in missing))
+        for i, single in zip(missing, singles):
+            results[i] = single
+    return [results[i] for i in range(len(comments))]
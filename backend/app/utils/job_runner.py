@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+class JobRunner:
+    """
+    Small in-process worker pool for database-backed jobs.
+
+    Only job ids pass through the runner; all job state lives in Postgres, so
+    the pool can be stopped at any point and `recover` (polled every
+    `recover_interval` seconds) will find unfinished work again.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[UUID], Awaitable[None]],
+        *,
+        workers: int,
+        recover: Callable[[], Awaitable[list[UUID]]] | None = None,
+        recover_interval: float = 60.0,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.recover = recover
+        self.recover_interval = recover_interval
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._queued: set[UUID] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, job_id: UUID) -> None:
+        if job_id in self._queued:
+            return
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.recover is not None:
+            self._tasks.append(asyncio.create_task(self._recover_loop()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        """Waits until every submitted job has been handled."""
+        await self._queue.join()
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.handler(job_id)
+            except Exception:
+                logger.exception("Job %s failed", job_id)
+            finally:
+                self._queued.discard(job_id)
+                self._queue.task_done()
+
+    async def _recover_loop(self) -> None:
+        while True:
+            try:
+                for job_id in await self.recover():
+                    self.submit(job_id)
+            except Exception:
+                logger.exception("Job recovery failed")
+            await asyncio.sleep(self.recover_interval)
@@ -0,0 +1,109 @@
+import math
+import re
+from pydantic import BaseModel
+
+from app.utils.agent import Sentiment
+
+# Word weights on a -3..3 scale, tuned for stakeholder feedback on drafts
+LEXICON: dict[str, float] = {
+    # supportive
+    "+1": 1.5, "agree": 1.8, "agreed": 1.8, "agrees": 1.8, "appreciate": 2.0, "appreciated": 2.0,
+    "appropriate": 1.2, "approve": 2.0, "approved": 1.8, "balanced": 1.3, "beneficial": 2.0,
+    "benefit": 1.5, "benefits": 1.5, "best": 2.2, "better": 1.5, "clarity": 1.3, "clear": 1.2,
+    "commend": 2.2, "comprehensive": 1.5, "constructive": 1.5, "effective": 1.8, "efficient": 1.6,
+    "encourage": 1.4, "encouraging": 1.6, "endorse": 2.2, "excellent": 3.0, "fair": 1.3,
+    "good": 1.8, "great": 2.5, "helpful": 1.8, "improve": 1.2, "improved": 1.5, "improvement": 1.4,
+    "improves": 1.4, "laudable": 2.3, "like": 1.0, "necessary": 0.8, "positive": 1.8,
+    "practical": 1.3, "progressive": 1.5, "protect": 1.2, "reasonable": 1.3, "robust": 1.5,
+    "simplify": 1.2, "simplifies": 1.2, "strengthen": 1.5, "strengthens": 1.5, "support": 1.8,
+    "supported": 1.6, "supportive": 1.8, "supports": 1.8, "thank": 1.5, "thanks": 1.5,
+    "timely": 1.4, "transparent": 1.6, "transparency": 1.4, "useful": 1.6, "welcome": 2.0,
+    "welcomed": 2.0, "welcomes": 2.0, "well": 1.0,
+    # critical
+    "absurd": -2.5, "ambiguity": -1.6, "ambiguous": -1.8, "arbitrary": -2.0, "bad": -2.2,
+    "burden": -1.8, "burdensome": -2.2, "complicated": -1.4, "concern": -1.4, "concerned": -1.5,
+    "concerns": -1.4, "confusing": -1.8, "costly": -1.6, "detrimental": -2.4, "difficult": -1.3,
+    "disagree": -2.0, "disappointed": -2.2, "disappointing": -2.2, "discriminatory": -2.5,
+    "excessive": -2.0, "fail": -2.0, "fails": -2.0, "flawed": -2.2, "harm": -2.2, "harmful": -2.5,
+    "harsh": -1.8, "impractical": -2.0, "inadequate": -2.0, "ineffective": -2.0, "inefficient": -1.8,
+    "insufficient": -1.8, "loophole": -1.6, "loopholes": -1.6, "misuse": -1.8, "negative": -1.8,
+    "object": -1.4, "objection": -1.6, "oppose": -2.2, "opposed": -2.2, "onerous": -2.2,
+    "penalise": -1.2, "penalize": -1.2, "poor": -2.0, "problem": -1.5, "problematic": -1.8,
+    "problems": -1.5, "reject": -2.4, "restrictive": -1.6, "risk": -1.2, "risky": -1.6,
+    "unclear": -1.6, "unfair": -2.2, "unjust": -2.4, "unnecessary": -1.8, "unreasonable": -2.0,
+    "unworkable": -2.3, "vague": -1.7, "withdraw": -1.5, "worse": -2.0, "worst": -2.8, "wrong": -2.0,
+}
+
+NEGATORS = frozenset({
+    "not", "no", "never", "nor", "neither", "without", "hardly", "barely", "cannot",
+    "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't", "won't",
+    "wouldn't", "shouldn't", "can't", "couldn't",
+})
+INTENSIFIERS: dict[str, float] = {
+    "very": 1.5, "extremely": 1.8, "highly": 1.5, "strongly": 1.6, "really": 1.3,
+    "completely": 1.6, "totally": 1.6, "absolutely": 1.8, "fully": 1.4, "deeply": 1.5,
+    "slightly": 0.6, "somewhat": 0.7, "partly": 0.7,
+}
+
+NEGATION_SCOPE = 3
+NEGATION_FACTOR = -0.75
+# Controls how quickly the summed weights saturate towards +/-1
+NORMALISATION_ALPHA = 15.0
+NEUTRAL_BAND = 0.1
+
+_TOKEN = re.compile(r"\+1|[a-z]+(?:'[a-z]+)?")
+
+class LexiconScore(BaseModel):
+    compound: float
+    confidence: float
+    keywords: list[str]
+
+def score_comment(comment: str) -> LexiconScore:
+    """
+    Scores a comment in [-1, 1] from the weights of the lexicon words it
+    contains, honouring negation and intensifiers in front of them.
+
+    `confidence` grows with how far the score is from neutral and with the
+    share of words the lexicon recognised; it is what callers compare
+    against a threshold to decide whether the result can be trusted.
+    """
+    tokens = _TOKEN.findall(comment.lower().replace("’", "'"))
+    total = 0.0
+    hits: dict[str, float] = {}
+    for i, token in enumerate(tokens):
+        weight = LEXICON.get(token)
+        if weight is None:
+            continue
+        window = tokens[max(0, i - NEGATION_SCOPE):i]
+        if window and window[-1] in INTENSIFIERS:
+            weight *= INTENSIFIERS[window[-1]]
+        if any(word in NEGATORS for word in window):
+            weight *= NEGATION_FACTOR
+        total += weight
+        hits[token] = hits.get(token, 0.0) + weight
+
+    if not hits:
+        return LexiconScore(compound=0.0, confidence=0.0, keywords=[])
+
+    compound = total / math.sqrt(total * total + NORMALISATION_ALPHA)
+    coverage = min(1.0, 4 * len(hits) / len(tokens))
+    confidence = abs(compound) * (0.5 + 0.5 * coverage)
+    keywords = sorted(hits, key=lambda word: abs(hits[word]), reverse=True)
+    return LexiconScore(compound=compound, confidence=round(confidence, 3), keywords=keywords[:5])
+
+def to_sentiment(score: LexiconScore) -> Sentiment:
+    if score.compound > NEUTRAL_BAND:
+        label = "positive"
+    elif score.compound < -NEUTRAL_BAND:
+        label = "negative"
+    else:
+        label = "neutral"
+    return Sentiment(
+        sentiment_analysis=label,
+        # Same 0..1 scale the analysis prompt asks the LLM for
+        sentiment_score=round((score.compound + 1) / 2, 2),
+        sentiment_keywords=", ".join(score.keywords),
+    )
+
+def analyse_comments(comments: list[str]) -> list[Sentiment]:
+    return [to_sentiment(score_comment(comment)) for comment in comments]
@@ -1,8 +1,121 @@
-import PyPDF2
+import asyncio
+import mmap
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, BinaryIO
 
-def extract_text_from_pdf(file):
-    reader = PyPDF2.PdfReader(file)
-    text = ""
+from app.core.config import settings
+from app.utils.worker_pool import WorkerPool
+from app.utils.uploads import map_upload, upload_path
+
+if TYPE_CHECKING:
+    import PyPDF2
+
+class PdfLimitExceeded(Exception):
+    pass
+
+pdf_extract_pool = WorkerPool(
+    workers=settings.PDF_EXTRACT_WORKERS,
+    max_pending=settings.PDF_EXTRACT_MAX_PENDING,
+    timeout=settings.PDF_EXTRACT_TIMEOUT_SECONDS,
+    name="pdf_extract_pool",
+    busy_message="PDF extraction is busy, try again later",
+    timeout_message=f"Extracting the PDF's text took longer than {settings.PDF_EXTRACT_TIMEOUT_SECONDS}s",
+)
+
+def _check_page_count(page_count: int) -> None:
+    if page_count > settings.PDF_MAX_PAGES:
+        raise PdfLimitExceeded(f"PDF has {page_count} pages, the limit is {settings.PDF_MAX_PAGES}")
+
+def _add_text_size(size: int, page: str) -> int:
+    size += len(page)
+    if size > settings.PDF_MAX_TEXT_CHARS:
+        raise PdfLimitExceeded(f"PDF text exceeds {settings.PDF_MAX_TEXT_CHARS} characters")
+    return size
+
+def _pdf_reader(stream) -> "PyPDF2.PdfReader":
+    # Imported here so that only processes that actually parse PDFs load it
+    import PyPDF2
+    return PyPDF2.PdfReader(stream)
+
+def iter_pdf_pages(file) -> Iterator[str]:
+    """Yields the text of each page in order, extracting them one at a time"""
+    reader = _pdf_reader(file)
+    _check_page_count(len(reader.pages))
+    size = 0
     for page in reader.pages:
-        text += page.extract_text() or ""
-    return text
+        text = page.extract_text() or ""
+        size = _add_text_size(size, text)
+        yield text
+
+def extract_text_from_pdf(file) -> str:
+    return "".join(iter_pdf_pages(file))
+
+def _extract_pages(reader: "PyPDF2.PdfReader", start: int, stop: int) -> list[str]:
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _extract_page_range(path: str, start: int, stop: int) -> list[str]:
+    # Runs in a worker process, which maps and parses the document itself
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _extract_pages(_pdf_reader(mapped), start, stop)
+
+def _read_small_pdf(file: BinaryIO) -> tuple[int, list[str] | None]:
+    """Page count, plus the pages themselves when they fit in one task"""
+    with map_upload(file) as mapped:
+        reader = _pdf_reader(mapped)
+        page_count = len(reader.pages)
+        _check_page_count(page_count)
+        if page_count > settings.PDF_EXTRACT_PAGES_PER_TASK:
+            return page_count, None
+        return page_count, _extract_pages(reader, 0, page_count)
+
+async def _stream_pages(file: BinaryIO) -> AsyncIterator[str]:
+    page_count, pages = await asyncio.to_thread(_read_small_pdf, file)
+    if pages is not None:
+        for page in pages:
+            yield page
+        return
+
+    pages_per_task = settings.PDF_EXTRACT_PAGES_PER_TASK
+    # Keep one page range per worker in flight and hand pages back in order
+    ranges = deque((start, min(start + pages_per_task, page_count))
+                   for start in range(0, page_count, pages_per_task))
+    pending: deque[asyncio.Task] = deque()
+
+    with ExitStack() as stack:
+        path = await asyncio.to_thread(stack.enter_context, upload_path(file, suffix=".pdf"))
+
+        def schedule() -> None:
+            while ranges and len(pending) < pdf_extract_pool.workers:
+                start, stop = ranges.popleft()
+                pending.append(asyncio.create_task(
+                    pdf_extract_pool.run(_extract_page_range, path, start, stop)
+                ))
+
+        try:
+            schedule()
+            while pending:
+                pages = await pending.popleft()
+                schedule()
+                for page in pages:
+                    yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+async def stream_pdf_pages(file: BinaryIO) -> AsyncIterator[str]:
+    """
+    Yields the text of each page of an uploaded file in order without
+    blocking the event loop. Small documents are extracted in a thread from
+    a memory map of the upload; larger ones are copied to a named temp file
+    and split into page ranges extracted in parallel by `pdf_extract_pool`.
+    Raises PdfLimitExceeded once the page or text size limits are crossed.
+    """
+    size = 0
+    async for page in _stream_pages(file):
+        size = _add_text_size(size, page)
+        yield page
+
+async def extract_text(file: BinaryIO) -> str:
+    return "".join([page async for page in stream_pdf_pages(file)])
@@ -0,0 +1,11 @@
+from app.core.config import settings
+from app.utils.worker_pool import WorkerPool
+
+render_pool = WorkerPool(
+    workers=settings.PDF_RENDER_WORKERS,
+    max_pending=settings.PDF_RENDER_MAX_PENDING,
+    timeout=settings.PDF_RENDER_TIMEOUT_SECONDS,
+    name="render_pool",
+    busy_message="Report renderer is busy, try again later",
+    timeout_message=f"Rendering took longer than {settings.PDF_RENDER_TIMEOUT_SECONDS}s",
+)
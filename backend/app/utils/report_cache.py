@@ -0,0 +1,107 @@
+import asyncio
+import os
+from collections import OrderedDict
+from pathlib import Path
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class ReportCache:
+    """
+    Rendered reports (one entry per format) keyed by draft and format, each
+    tagged with the draft version it was rendered from.
+
+    The memory tier is an LRU capped at `max_bytes`. When `directory` is
+    set, reports are also written there so they survive restarts and are
+    shared between workers on the same host. An entry whose version differs
+    from the requested one is stale and is dropped on sight.
+    """
+
+    def __init__(self, max_bytes: int, directory: str | None = None):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[tuple[UUID, str], tuple[str, bytes]] = OrderedDict()
+        self._size = 0
+
+    def _discard(self, key: tuple[UUID, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def _store(self, key: tuple[UUID, str], version: str, content: bytes) -> None:
+        self._discard(key)
+        if len(content) > self.max_bytes:
+            return
+        self._entries[key] = (version, content)
+        self._size += len(content)
+        while self._size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, draft_id: UUID, version: str, format: str) -> Path:
+        return self.directory / f"{draft_id}-{version}.{format}"
+
+    def _remove_files(self, pattern: str, keep: Path | None = None) -> None:
+        for path in self.directory.glob(pattern):
+            # Temp files belong to a write in progress, which cleans up after itself
+            if path != keep and path.suffix != ".tmp":
+                path.unlink(missing_ok=True)
+
+    def _read_file(self, draft_id: UUID, version: str, format: str) -> bytes | None:
+        path = self._path(draft_id, version, format)
+        self._remove_files(f"{draft_id}-*.{format}", keep=path)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write_file(self, draft_id: UUID, version: str, format: str, content: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(draft_id, version, format)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(content)
+            tmp.replace(path)
+        except FileNotFoundError:
+            # The directory or temp file was cleared under us; the report just isn't cached
+            tmp.unlink(missing_ok=True)
+            return
+        self._remove_files(f"{draft_id}-*.{format}", keep=path)
+
+    async def get(self, draft_id: UUID, version: str, format: str) -> bytes | None:
+        key = (draft_id, format)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == version:
+                self._entries.move_to_end(key)
+                metrics.increment("report_cache.memory_hits")
+                return entry[1]
+            self._discard(key)
+            metrics.increment("report_cache.stale")
+
+        if self.directory is not None:
+            content = await asyncio.to_thread(self._read_file, draft_id, version, format)
+            if content is not None:
+                self._store(key, version, content)
+                metrics.increment("report_cache.disk_hits")
+                return content
+
+        metrics.increment("report_cache.misses")
+        return None
+
+    async def set(self, draft_id: UUID, version: str, format: str, content: bytes) -> None:
+        self._store((draft_id, format), version, content)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write_file, draft_id, version, format, content)
+
+    async def invalidate(self, draft_id: UUID) -> None:
+        for key in [key for key in self._entries if key[0] == draft_id]:
+            self._discard(key)
+        if self.directory is not None and self.directory.exists():
+            await asyncio.to_thread(self._remove_files, f"{draft_id}-*")
+
+report_cache = ReportCache(
+    max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    directory=settings.REPORT_CACHE_DIR,
+)
@@ -0,0 +1,52 @@
+import os
+from typing import Any, Dict
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.core.config import settings
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(BASE_DIR, "../templates")
+
+# Report format -> template file
+REPORT_TEMPLATES = {
+    "html": "report.html",
+    "md": "report.md",
+    "csv": "report_summary.csv",
+}
+
+def csv_field(value: Any) -> str:
+    """Quotes a value for a CSV cell when it contains a delimiter, quote or newline"""
+    text = str(value)
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def _build_environment() -> Environment:
+    bytecode_cache = None
+    if settings.REPORT_TEMPLATE_BYTECODE_DIR:
+        os.makedirs(settings.REPORT_TEMPLATE_BYTECODE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(settings.REPORT_TEMPLATE_BYTECODE_DIR)
+
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"]),
+        bytecode_cache=bytecode_cache,
+        # Templates ship with the code, so compiled ones never need re-checking on disk
+        auto_reload=False,
+        keep_trailing_newline=True,
+    )
+    environment.filters["csv_field"] = csv_field
+    return environment
+
+# Compiled templates are cached on the environment, so each one is parsed once per process
+environment = _build_environment()
+
+def warm_templates() -> None:
+    """Compiles every report template up front so the first request doesn't pay for it"""
+    for name in REPORT_TEMPLATES.values():
+        environment.get_template(name)
+
+def render_report(report_data: Dict[str, Any], format: str) -> str:
+    """Render report data with the template for the given format"""
+    return environment.get_template(REPORT_TEMPLATES[format]).render(**report_data)
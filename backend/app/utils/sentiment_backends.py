@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.utils import lexicon_sentiment
+from app.utils.agent import Sentiment, analyse_batch, get_analysis_agent
+from app.utils.sentiment_cache import sentiment_cache
+
+logger = logging.getLogger(__name__)
+
+class SentimentBackend(ABC):
+    """
+    Something that can fill the Sentiment fields for a batch of comments.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def analyse_many(self, comments: list[str]) -> list[Sentiment]:
+        """Returns one Sentiment per comment, in input order."""
+
+    async def analyse(self, comment: str) -> Sentiment:
+        return (await self.analyse_many([comment]))[0]
+
+class LLMSentimentBackend(SentimentBackend):
+    """
+    The analysis agent, behind the sentiment result cache.
+    """
+
+    name = "llm"
+
+    async def _run_agent(self, comment: str) -> Sentiment:
+        result = await get_analysis_agent().run(comment)
+        return result.output
+
+    async def analyse(self, comment: str) -> Sentiment:
+        return await sentiment_cache.get_or_compute(comment, self._run_agent)
+
+    async def analyse_many(self, comments: list[str]) -> list[Sentiment]:
+        if len(comments) == 1:
+            return [await self.analyse(comments[0])]
+
+        # Repeated comments in a batch, and ones another request is already
+        # analysing, only reach the LLM once
+        return await sentiment_cache.get_or_compute_many(comments, analyse_batch)
+
+class LexiconSentimentBackend(SentimentBackend):
+    """
+    CPU-only scorer from `lexicon_sentiment`. Needs no network, so it also
+    serves as the backend for offline runs and tests.
+    """
+
+    name = "lexicon"
+
+    async def analyse_many(self, comments: list[str]) -> list[Sentiment]:
+        return lexicon_sentiment.analyse_comments(comments)
+
+class FallbackSentimentBackend(SentimentBackend):
+    """
+    Uses `primary`, switching to `fallback` for a batch when the primary
+    errors or takes longer than `timeout` seconds. Fallback results are not
+    cached, so the comments get a proper analysis next time they are seen.
+    """
+
+    def __init__(self, primary: SentimentBackend, fallback: SentimentBackend, timeout: float):
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout = timeout
+        self.name = f"{primary.name}+{fallback.name}"
+
+    async def _with_fallback(self, call, comments: list[str]) -> list[Sentiment]:
+        try:
+            return await asyncio.wait_for(call, timeout=self.timeout)
+        except TimeoutError:
+            logger.warning("%s backend exceeded %ss, falling back", self.primary.name, self.timeout)
+            metrics.increment("sentiment_backend.fallback_timeouts")
+        except Exception:
+            logger.warning("%s backend failed, falling back", self.primary.name, exc_info=True)
+            metrics.increment("sentiment_backend.fallback_errors")
+        metrics.increment("sentiment_backend.fallback_comments", len(comments))
+        return await self.fallback.analyse_many(comments)
+
+    async def analyse(self, comment: str) -> Sentiment:
+        async def analyse_one():
+            return [await self.primary.analyse(comment)]
+        return (await self._with_fallback(analyse_one(), [comment]))[0]
+
+    async def analyse_many(self, comments: list[str]) -> list[Sentiment]:
+        return await self._with_fallback(self.primary.analyse_many(comments), comments)
+
+class TieredSentimentBackend(SentimentBackend):
+    """
+    Scores every comment with the lexicon engine first and keeps the result
+    when its confidence reaches `threshold`; only the uncertain rest is
+    sent to `remote`. Tier counts and per-call latencies are recorded under
+    `sentiment_tier.*` so the threshold can be tuned against LLM spend.
+    """
+
+    def __init__(self, remote: SentimentBackend, threshold: float):
+        self.remote = remote
+        self.threshold = threshold
+        self.name = f"tiered({remote.name})"
+
+    async def analyse_many(self, comments: list[str]) -> list[Sentiment]:
+        started = time.perf_counter()
+        scores = [lexicon_sentiment.score_comment(comment) for comment in comments]
+        sentiments: list[Sentiment | None] = [
+            lexicon_sentiment.to_sentiment(score) if score.confidence >= self.threshold else None
+            for score in scores
+        ]
+        uncertain = [i for i, sentiment in enumerate(sentiments) if sentiment is None]
+        metrics.increment("sentiment_tier.local", len(comments) - len(uncertain))
+        metrics.increment("sentiment_tier.llm", len(uncertain))
+        metrics.observe("sentiment_tier.local_seconds", time.perf_counter() - started)
+
+        if uncertain:
+            started = time.perf_counter()
+            remote = await self.remote.analyse_many([comments[i] for i in uncertain])
+            metrics.observe("sentiment_tier.llm_seconds", time.perf_counter() - started)
+            for i, sentiment in zip(uncertain, remote):
+                sentiments[i] = sentiment
+        return sentiments
+
+def build_sentiment_backend(name: str) -> SentimentBackend:
+    if name == LexiconSentimentBackend.name:
+        return LexiconSentimentBackend()
+    if name == LLMSentimentBackend.name:
+        backend: SentimentBackend = LLMSentimentBackend()
+        if settings.SENTIMENT_LLM_TIMEOUT_SECONDS > 0:
+            backend = FallbackSentimentBackend(
+                backend,
+                LexiconSentimentBackend(),
+                timeout=settings.SENTIMENT_LLM_TIMEOUT_SECONDS,
+            )
+        if settings.SENTIMENT_LOCAL_CONFIDENCE_THRESHOLD <= 1:
+            backend = TieredSentimentBackend(
+                backend, threshold=settings.SENTIMENT_LOCAL_CONFIDENCE_THRESHOLD
+            )
+        return backend
+    raise ValueError(f"Unknown sentiment backend: {name}")
+
+sentiment_backend = build_sentiment_backend(settings.SENTIMENT_BACKEND)
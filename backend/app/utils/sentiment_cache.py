@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from functools import cache
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import AsyncSessionLocal
+from app.models.sentiment_cache_model import SentimentCacheEntry
+from app.utils.agent import ANALYSIS_MODEL_NAME, Sentiment, get_analysis_instructions
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n.,;:!?\"'`()[]{}<>-_*~"
+
+def normalise_comment(text: str) -> str:
+    """
+    Folds the differences reviewers don't mean anything by: unicode forms,
+    case, repeated whitespace and punctuation around the comment.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+@cache
+def analysis_prompt_hash() -> str:
+    return hashlib.sha256(get_analysis_instructions().encode("utf-8")).hexdigest()[:16]
+
+def cache_key(text: str, model_name: str = ANALYSIS_MODEL_NAME, prompt_hash: str | None = None) -> str:
+    prompt_hash = prompt_hash or analysis_prompt_hash()
+    payload = f"{model_name}\0{prompt_hash}\0{normalise_comment(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SentimentCache:
+    """
+    Two-tier cache of analysis results keyed by `cache_key`.
+
+    The first tier is a per-process LRU; the second is the `sentiment_cache`
+    table, shared by every worker. Entries in both tiers expire after
+    `ttl_seconds`. Concurrent lookups for the same key share one computation.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Sentiment, float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _get_memory(self, key: str) -> Sentiment | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        sentiment, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return sentiment
+
+    def _set_memory(self, key: str, sentiment: Sentiment) -> None:
+        self._entries[key] = (sentiment, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_db(self, keys: list[str]) -> dict[str, Sentiment]:
+        # The table is only an optimisation: if it can't be read, treat it as a miss
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.exec(
+                    select(SentimentCacheEntry).where(
+                        SentimentCacheEntry.key.in_(keys),
+                        SentimentCacheEntry.created_at > datetime.utcnow() - timedelta(seconds=self.ttl_seconds),
+                    )
+                )
+                entries = result.all()
+        except Exception:
+            logger.warning("Sentiment cache lookup failed, treating %d keys as misses", len(keys), exc_info=True)
+            metrics.increment("sentiment_cache.db_errors")
+            return {}
+        return {
+            entry.key: Sentiment(
+                sentiment_analysis=entry.sentiment_analysis,
+                sentiment_score=entry.sentiment_score,
+                sentiment_keywords=entry.sentiment_keywords,
+            )
+            for entry in entries
+        }
+
+    async def _set_db(self, items: dict[str, Sentiment]) -> None:
+        # A failed write only costs a future cache hit, so it mustn't fail the caller
+        statement = insert(SentimentCacheEntry)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[SentimentCacheEntry.key],
+                        set_={
+                            "sentiment_analysis": statement.excluded.sentiment_analysis,
+                            "sentiment_score": statement.excluded.sentiment_score,
+                            "sentiment_keywords": statement.excluded.sentiment_keywords,
+                            "created_at": statement.excluded.created_at,
+                        },
+                    ),
+                    [
+                        {"key": key, "created_at": datetime.utcnow(), **sentiment.model_dump()}
+                        for key, sentiment in items.items()
+                    ],
+                )
+                await db.commit()
+        except Exception:
+            logger.warning("Sentiment cache write of %d entries failed", len(items), exc_info=True)
+            metrics.increment("sentiment_cache.db_errors")
+
+    async def get_many(self, texts: list[str]) -> list[Sentiment | None]:
+        """Looks up several comments, with one db query for all memory misses."""
+        keys = [cache_key(text) for text in texts]
+        found = {key: sentiment for key in keys if (sentiment := self._get_memory(key)) is not None}
+        metrics.increment("sentiment_cache.memory_hits", sum(key in found for key in keys))
+
+        remaining = [key for key in dict.fromkeys(keys) if key not in found]
+        if remaining:
+            from_db = await self._get_db(remaining)
+            for key, sentiment in from_db.items():
+                self._set_memory(key, sentiment)
+            metrics.increment("sentiment_cache.db_hits", sum(key in from_db for key in keys))
+            metrics.increment("sentiment_cache.misses", sum(key not in found and key not in from_db for key in keys))
+            found.update(from_db)
+        return [found.get(key) for key in keys]
+
+    async def set_many(self, items: list[tuple[str, Sentiment]]) -> None:
+        by_key = {cache_key(text): sentiment for text, sentiment in items}
+        if not by_key:
+            return
+        for key, sentiment in by_key.items():
+            self._set_memory(key, sentiment)
+        await self._set_db(by_key)
+
+    async def get(self, text: str) -> Sentiment | None:
+        return (await self.get_many([text]))[0]
+
+    async def set(self, text: str, sentiment: Sentiment) -> None:
+        await self.set_many([(text, sentiment)])
+
+    async def get_or_compute(
+        self, text: str, compute: Callable[[str], Awaitable[Sentiment]]
+    ) -> Sentiment:
+        key = cache_key(text)
+        while (inflight := self._inflight.get(key)) is not None:
+            metrics.increment("sentiment_cache.inflight_hits")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The computing caller was cancelled; try again ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            sentiment = await self.get(text)
+            if sentiment is None:
+                sentiment = await compute(text)
+                await self.set(text, sentiment)
+            future.set_result(sentiment)
+            return sentiment
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; nobody is left to retrieve it otherwise
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def get_or_compute_many(
+        self, texts: list[str], compute_many: Callable[[list[str]], Awaitable[list[Sentiment]]]
+    ) -> list[Sentiment]:
+        """
+        Batch form of `get_or_compute`. Texts sharing a cache key are looked up
+        and computed once, and keys another caller is already computing are
+        awaited instead of being computed again; each result is copied to
+        every position that needs it.
+        """
+        keys = [cache_key(text) for text in texts]
+        text_by_key: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            text_by_key.setdefault(key, text)
+        metrics.increment("sentiment_cache.batch_duplicates", len(keys) - len(text_by_key))
+
+        waiting = {key: inflight for key in text_by_key if (inflight := self._inflight.get(key)) is not None}
+        own = [key for key in text_by_key if key not in waiting]
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in own}
+        self._inflight.update(futures)
+        results: dict[str, Sentiment] = {}
+        try:
+            if own:
+                cached = await self.get_many([text_by_key[key] for key in own])
+                missing = [key for key, sentiment in zip(own, cached) if sentiment is None]
+                results.update((key, sentiment) for key, sentiment in zip(own, cached) if sentiment is not None)
+                if missing:
+                    fresh = await compute_many([text_by_key[key] for key in missing])
+                    results.update(zip(missing, fresh))
+                    await self.set_many([(text_by_key[key], results[key]) for key in missing])
+                for key in own:
+                    futures[key].set_result(results[key])
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()
+            raise
+        finally:
+            for key in own:
+                del self._inflight[key]
+
+        async def compute_one(text: str) -> Sentiment:
+            return (await compute_many([text]))[0]
+
+        for key, inflight in waiting.items():
+            metrics.increment("sentiment_cache.inflight_hits")
+            try:
+                results[key] = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The computing caller was cancelled; compute it ourselves
+                results[key] = await self.get_or_compute(text_by_key[key], compute_one)
+        return [results[key] for key in keys]
+
+    async def purge_expired(self) -> int:
+        """Deletes expired rows from the persistent tier."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(SentimentCacheEntry).where(
+                    SentimentCacheEntry.created_at <= datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+                )
+            )
+            await db.commit()
+        return result.rowcount
+
+    async def purge_periodically(self, interval: float) -> None:
+        """Runs `purge_expired` now and then every `interval` seconds, until cancelled."""
+        while True:
+            try:
+                purged = await self.purge_expired()
+                metrics.increment("sentiment_cache.purged", purged)
+            except Exception:
+                logger.warning("Purging expired sentiment cache entries failed", exc_info=True)
+            await asyncio.sleep(interval)
+
+sentiment_cache = SentimentCache(
+    max_entries=settings.SENTIMENT_CACHE_SIZE,
+    ttl_seconds=settings.SENTIMENT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,104 @@
+from collections.abc import Iterable
+from sqlalchemy import case, func
+
+NEGATIVE_LABELS = ("negative", "critical", "bad")
+POSITIVE_LABELS = ("positive", "supportive", "good")
+
+def normalised_score(sentiment_score: float | None) -> float:
+    """
+    Maps a stored score to the -1..1 scale used in reports. Scores on the
+    0..1 scale are stretched; anything missing or unparseable counts as 0.
+    """
+    try:
+        score = float(sentiment_score)
+    except (TypeError, ValueError):
+        return 0.0
+    if 0 <= score <= 1:
+        return (score - 0.5) * 2
+    return score
+
+def sentiment_label(sentiment_analysis: str | None, sentiment_score: float | None) -> str:
+    """
+    Buckets a comment as positive, negative or neutral, preferring the
+    stored label and deriving one from the score only when it is missing.
+    """
+    if sentiment_analysis:
+        value = sentiment_analysis.lower()
+    else:
+        try:
+            score = float(sentiment_score)
+        except (TypeError, ValueError):
+            return "neutral"
+        if 0 <= score <= 1:
+            value = "positive" if score > 0.6 else "negative" if score < 0.4 else "neutral"
+        else:
+            value = "positive" if score > 0.1 else "negative" if score < -0.1 else "neutral"
+
+    if value in NEGATIVE_LABELS:
+        return "negative"
+    if value in POSITIVE_LABELS:
+        return "positive"
+    return "neutral"
+
+def aggregate_sentiments(rows: Iterable[tuple[str | None, float | None]]) -> dict[str, float]:
+    """
+    Folds (sentiment_analysis, sentiment_score) pairs into the additive
+    totals kept in `draft_stats`.
+    """
+    totals = {
+        "comment_count": 0,
+        "score_sum": 0.0,
+        "score_sum_sq": 0.0,
+        "positive_count": 0,
+        "negative_count": 0,
+        "neutral_count": 0,
+    }
+    for sentiment_analysis, sentiment_score in rows:
+        score = normalised_score(sentiment_score)
+        totals["comment_count"] += 1
+        totals["score_sum"] += score
+        totals["score_sum_sq"] += score * score
+        totals[f"{sentiment_label(sentiment_analysis, sentiment_score)}_count"] += 1
+    return totals
+
+# SQL equivalents of the functions above, for aggregating inside Postgres
+
+def normalised_score_sql(sentiment_score):
+    return case(
+        (sentiment_score.between(0, 1), (sentiment_score - 0.5) * 2),
+        else_=func.coalesce(sentiment_score, 0.0),
+    )
+
+def sentiment_label_sql(sentiment_analysis, sentiment_score):
+    label = func.lower(sentiment_analysis)
+    return case(
+        (func.coalesce(sentiment_analysis, "") != "", case(
+            (label.in_(NEGATIVE_LABELS), "negative"),
+            (label.in_(POSITIVE_LABELS), "positive"),
+            else_="neutral",
+        )),
+        (sentiment_score.between(0, 1), case(
+            (sentiment_score > 0.6, "positive"),
+            (sentiment_score < 0.4, "negative"),
+            else_="neutral",
+        )),
+        (sentiment_score > 0.1, "positive"),
+        (sentiment_score < -0.1, "negative"),
+        else_="neutral",
+    )
+
+def aggregate_sentiments_sql(sentiment_analysis, sentiment_score) -> dict:
+    """
+    Column expressions producing the `aggregate_sentiments` totals in SQL,
+    for use in a select grouped by draft.
+    """
+    score = normalised_score_sql(sentiment_score)
+    label = sentiment_label_sql(sentiment_analysis, sentiment_score)
+    return {
+        "comment_count": func.count(),
+        "score_sum": func.coalesce(func.sum(score), 0.0),
+        "score_sum_sq": func.coalesce(func.sum(score * score), 0.0),
+        "positive_count": func.count().filter(label == "positive"),
+        "negative_count": func.count().filter(label == "negative"),
+        "neutral_count": func.count().filter(label == "neutral"),
+    }
\ No newline at end of file
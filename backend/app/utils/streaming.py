@@ -0,0 +1,17 @@
+import json
+from typing import Any
+
+def sse_event(data: Any, event: str | None = None) -> str:
+    """One server-sent event frame with `data` encoded as JSON"""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+def sse_comment(text: str = "keep-alive") -> str:
+    """A comment frame, which clients ignore; keeps idle connections open"""
+    return f": {text}\n\n"
+
+def ndjson_line(data: dict, event: str | None = None) -> str:
+    """One newline-delimited JSON record, tagged with `type` when `event` is given"""
+    if event:
+        data = {"type": event, **data}
+    return json.dumps(data, default=str) + "\n"
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import re
+from collections.abc import Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import AsyncSessionLocal
+from app.models.summary_chunk_model import SummaryChunk
+from app.utils.agent import (
+    SUMMARY_MODEL_NAME,
+    estimate_tokens,
+    get_chunk_summary_agent,
+    get_chunk_summary_instructions,
+    get_summary_agent,
+    get_summary_instructions,
+    get_summary_reduce_agent,
+    get_summary_reduce_instructions,
+)
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+# Lines that open a numbered section, chapter, clause and so on
+_SECTION_START = re.compile(
+    r"(?im)^(?=[ \t]*(?:(?:section|chapter|part|article|clause|schedule|rule)[ \t]+[\dIVXLC]+\b|\d+(?:\.\d+)*[.)][ \t]))"
+)
+_PARAGRAPH_BREAK = re.compile(r"(?<=\n)[ \t]*\n")
+
+def _prompt_hash(instructions: str) -> str:
+    return hashlib.sha256(instructions.encode("utf-8")).hexdigest()[:16]
+
+def summary_key(text: str, prompt_hash: str, model_name: str = SUMMARY_MODEL_NAME) -> str:
+    payload = f"{model_name}\0{prompt_hash}\0{text.strip()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _split_oversized(text: str, max_tokens: int) -> list[str]:
+    """Splits text over the budget at section starts, then paragraphs, then whitespace."""
+    for boundary in (_SECTION_START, _PARAGRAPH_BREAK):
+        parts = [part for part in boundary.split(text) if part.strip()]
+        if len(parts) > 1:
+            return [
+                piece
+                for part in parts
+                for piece in (_split_oversized(part, max_tokens) if estimate_tokens(part) > max_tokens else [part])
+            ]
+
+    max_chars = max_tokens * 4
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(text[:cut])
+        text = text[cut:]
+    pieces.append(text)
+    return pieces
+
+def _ends_chunk(piece: str, max_tokens: int) -> bool:
+    """
+    Whether a chunk closes after this piece. Decided from the piece's own
+    content, so the same piece ends a chunk wherever it appears; the odds
+    grow with its size, so most chunks close well before the budget.
+    """
+    digest = int.from_bytes(hashlib.sha256(piece.encode("utf-8")).digest()[:8], "big")
+    return digest / 2**64 < estimate_tokens(piece) / (max_tokens / 2)
+
+def split_into_chunks(pages: Sequence[str], max_tokens: int) -> list[str]:
+    """
+    Groups consecutive pages into chunks of at most `max_tokens`, splitting
+    only pages that are over the budget alone.
+
+    Chunks end after pages picked by `_ends_chunk` rather than wherever the
+    budget runs out, so boundaries don't shift when an earlier page changes
+    length: an edit only changes the chunk holding it (or merges it with the
+    next), and every other chunk keeps its text and cached summary.
+    """
+    pieces = [
+        piece
+        for page in pages
+        for piece in (_split_oversized(page, max_tokens) if estimate_tokens(page) > max_tokens else [page])
+        if piece.strip()
+    ]
+    chunks: list[str] = []
+    current: list[str] = []
+    tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and tokens + piece_tokens > max_tokens:
+            chunks.append("".join(current))
+            current, tokens = [], 0
+        current.append(piece)
+        tokens += piece_tokens
+        if _ends_chunk(piece, max_tokens):
+            chunks.append("".join(current))
+            current, tokens = [], 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+async def _get_cached(keys: list[str]) -> dict[str, str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.exec(select(SummaryChunk).where(SummaryChunk.key.in_(keys)))
+        return {entry.key: entry.summary for entry in result.all()}
+
+async def _set_cached(items: dict[str, str]) -> None:
+    statement = insert(SummaryChunk)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[SummaryChunk.key],
+                set_={"summary": statement.excluded.summary, "created_at": statement.excluded.created_at},
+            ),
+            [{"key": key, "summary": summary, "created_at": datetime.utcnow()} for key, summary in items.items()],
+        )
+        await db.commit()
+
+async def _summarise_many(texts: list[str], agent: "Agent", instructions: str) -> list[str]:
+    """
+    Summarises each text with `agent`, at most SUMMARY_CONCURRENCY at a time,
+    reusing cached summaries of identical texts.
+    """
+    prompt_hash = _prompt_hash(instructions)
+    keys = [summary_key(text, prompt_hash) for text in texts]
+    summaries = await _get_cached(list(set(keys)))
+    missing = {key: text for key, text in zip(keys, texts) if key not in summaries}
+    metrics.increment("summary.chunk_cache_hits", len(keys) - len(missing))
+    metrics.increment("summary.chunk_cache_misses", len(missing))
+
+    if missing:
+        semaphore = asyncio.Semaphore(settings.SUMMARY_CONCURRENCY)
+
+        async def summarise(text: str) -> str:
+            async with semaphore:
+                return (await agent.run(text)).output
+
+        fresh = await asyncio.gather(*(summarise(text) for text in missing.values()))
+        fresh_by_key = dict(zip(missing, fresh))
+        await _set_cached(fresh_by_key)
+        summaries.update(fresh_by_key)
+    return [summaries[key] for key in keys]
+
+async def summarise_draft(pages: Sequence[str]) -> str:
+    """
+    Summarises a draft from its pages. Drafts within
+    SUMMARY_SINGLE_PASS_MAX_TOKENS go to the summary agent in one request.
+    Longer ones are split into chunks that are summarised concurrently, and
+    the chunk summaries are merged by the reduce agent.
+    """
+    text = "".join(pages)
+    if estimate_tokens(text) <= settings.SUMMARY_SINGLE_PASS_MAX_TOKENS:
+        return (await _summarise_many([text], get_summary_agent(), get_summary_instructions()))[0]
+
+    chunks = split_into_chunks(pages, settings.SUMMARY_CHUNK_MAX_TOKENS)
+    metrics.increment("summary.chunked_drafts")
+    metrics.increment("summary.chunks", len(chunks))
+    summaries = await _summarise_many(chunks, get_chunk_summary_agent(), get_chunk_summary_instructions())
+
+    # The summaries of a very long draft may themselves need condensing before they fit
+    while len(summaries) > 1:
+        combined = "\n\n".join(summaries)
+        if estimate_tokens(combined) <= settings.SUMMARY_SINGLE_PASS_MAX_TOKENS:
+            break
+        groups = split_into_chunks([summary + "\n\n" for summary in summaries], settings.SUMMARY_CHUNK_MAX_TOKENS)
+        if len(groups) == len(summaries):
+            break
+        summaries = await _summarise_many(groups, get_chunk_summary_agent(), get_chunk_summary_instructions())
+
+    return (await _summarise_many(["\n\n".join(summaries)], get_summary_reduce_agent(), get_summary_reduce_instructions()))[0]
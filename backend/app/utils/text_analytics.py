@@ -0,0 +1,88 @@
+import re
+
+from app.models.draft_model import DraftAnalytics
+
+def calculate_draft_length(draft_content: str) -> dict:
+    """Calculate draft length metrics"""
+    if not draft_content:
+        return {"words": 0, "characters": 0, "sentences": 0, "avg_words_per_sentence": 0}
+
+    words = len(draft_content.split())
+    characters = len(draft_content)
+    sentences = len([s for s in re.split(r'[.!?]+', draft_content.strip()) if s.strip()])
+
+    return {
+        "words": words,
+        "characters": characters,
+        "sentences": max(sentences, 1),
+        "avg_words_per_sentence": round(words / max(sentences, 1), 1)
+    }
+
+def calculate_readability_score(draft_content: str) -> dict:
+    """Calculate readability using Flesch Reading Ease"""
+    if not draft_content or len(draft_content.strip()) < 10:
+        return {"score": 50.0, "level": "standard", "grade_level": 8.0}
+
+    # textstat is slow to import, so it is only loaded once a score is needed
+    import textstat
+
+    try:
+        flesch_score = textstat.flesch_reading_ease(draft_content)
+
+        if flesch_score >= 90:
+            level = "very-easy"
+        elif flesch_score >= 80:
+            level = "easy"
+        elif flesch_score >= 70:
+            level = "fairly-easy"
+        elif flesch_score >= 60:
+            level = "standard"
+        elif flesch_score >= 50:
+            level = "fairly-difficult"
+        elif flesch_score >= 30:
+            level = "difficult"
+        else:
+            level = "very-difficult"
+
+        return {
+            "score": round(flesch_score, 1),
+            "level": level,
+            "grade_level": round(textstat.flesch_kincaid_grade(draft_content), 1)
+        }
+    except Exception:
+        return {"score": 50.0, "level": "standard", "grade_level": 8.0}
+
+def compute_draft_analytics(draft_content: str) -> DraftAnalytics:
+    """
+    Length and readability metrics for a draft's text. Draft text never
+    changes after upload, so this runs once there and the results are stored
+    on the draft.
+    """
+    length = calculate_draft_length(draft_content)
+    readability = calculate_readability_score(draft_content)
+    return DraftAnalytics(
+        word_count=length["words"],
+        character_count=length["characters"],
+        sentence_count=length["sentences"],
+        avg_words_per_sentence=length["avg_words_per_sentence"],
+        readability_score=readability["score"],
+        readability_level=readability["level"],
+        readability_grade_level=readability["grade_level"],
+    )
+
+def draft_length(analytics: DraftAnalytics) -> dict:
+    """The report's draft_length section from stored analytics"""
+    return {
+        "words": analytics.word_count,
+        "characters": analytics.character_count,
+        "sentences": analytics.sentence_count,
+        "avg_words_per_sentence": analytics.avg_words_per_sentence,
+    }
+
+def readability(analytics: DraftAnalytics) -> dict:
+    """The report's readability_score section from stored analytics"""
+    return {
+        "score": analytics.readability_score,
+        "level": analytics.readability_level,
+        "grade_level": analytics.readability_grade_level,
+    }
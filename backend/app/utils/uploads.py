@@ -0,0 +1,140 @@
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import BinaryIO
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.formparsers import MultiPartParser
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Neither Starlette nor tempfile offers a public way to do the next two
+# things, so they are kept here, behind the checks in tests/test_uploads.py,
+# which fail if a Starlette or Python upgrade changes either (tested with
+# Starlette 0.47 on Python 3.12).
+
+def configure_upload_spooling(max_memory: int) -> None:
+    """
+    Sets the size above which uploaded files are spooled to disk. Starlette
+    reads it from a MultiPartParser class attribute, so the setting is
+    process-wide; it is applied once, at startup.
+    """
+    if not isinstance(getattr(MultiPartParser, "spool_max_size", None), int):
+        raise RuntimeError("starlette.formparsers.MultiPartParser.spool_max_size is gone, see app.utils.uploads")
+    MultiPartParser.spool_max_size = max_memory
+
+def _spooled_buffer(file: BinaryIO) -> BinaryIO | None:
+    # A SpooledTemporaryFile that hasn't rolled over keeps its data in a
+    # BytesIO, held in the private `_file`
+    inner = getattr(file, "_file", file)
+    return inner if isinstance(inner, io.BytesIO) else None
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart requests whose body exceeds `max_bytes` with 413. The
+    declared Content-Length is checked up front and the streamed body is
+    counted as it arrives, so an oversized upload is cut off as soon as it
+    crosses the limit instead of being spooled in full first.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> str:
+        return f"Upload exceeds the {self.max_bytes} byte limit"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": self._too_large()}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised while the form is parsed, so FastAPI returns it as is
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+@contextmanager
+def map_upload(file: BinaryIO) -> Iterator[BinaryIO]:
+    """
+    A read-only, seekable view of an uploaded file that doesn't copy it into
+    memory: the spool's own buffer while it is small, a memory map of the
+    temp file once it has been spooled to disk.
+    """
+    buffer = _spooled_buffer(file)
+    if buffer is not None:
+        buffer.seek(0)
+        yield buffer
+        return
+
+    file.seek(0, os.SEEK_END)
+    if file.tell() == 0:
+        file.seek(0)
+        yield file
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+def hash_upload(file: BinaryIO) -> str:
+    """sha256 of an uploaded file, hashed straight from its spool"""
+    with map_upload(file) as mapped:
+        if isinstance(mapped, io.BytesIO):
+            with mapped.getbuffer() as view:
+                return hashlib.sha256(view).hexdigest()
+        if isinstance(mapped, mmap.mmap):
+            return hashlib.sha256(mapped).hexdigest()
+        return hashlib.sha256(mapped.read()).hexdigest()
+
+def take_upload(file: BinaryIO) -> BinaryIO:
+    """
+    Copies an upload into a spooled temp file owned by the caller, for work
+    that outlives the request handler: FastAPI closes uploaded files before
+    a streaming response body runs.
+    """
+    file.seek(0)
+    owned = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    shutil.copyfileobj(file, owned)
+    owned.seek(0)
+    return owned
+
+@contextmanager
+def upload_path(file: BinaryIO, suffix: str = "") -> Iterator[str]:
+    """
+    Copies an uploaded file to a named temp file, chunk by chunk, so worker
+    processes can open and map it themselves instead of being sent its bytes.
+    """
+    file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as target:
+        shutil.copyfileobj(file, target)
+    try:
+        yield target.name
+    finally:
+        os.unlink(target.name)
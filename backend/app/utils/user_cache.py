@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.user_model import User
+
+class UserCache:
+    """
+    Per-process LRU of authenticated users keyed by id, so `get_current_user`
+    does not query the users table on every request.
+
+    Only the user's column values are kept, and every hit gets a new
+    transient User built from them, so no request shares an ORM instance
+    with another or depends on the session the user was loaded in.
+
+    Entries expire after `ttl_seconds`, which bounds how long another worker
+    can keep serving a user that was changed or deleted elsewhere; in this
+    process `invalidate` drops them immediately. A `ttl_seconds` of 0
+    disables the cache.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[UUID, tuple[dict, float]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> User | None:
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            metrics.increment("user_cache.misses")
+            return None
+        values, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            metrics.increment("user_cache.misses")
+            return None
+        self._entries.move_to_end(user_id)
+        metrics.increment("user_cache.hits")
+        return User(**values)
+
+    def set(self, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        values = {name: getattr(user, name) for name in User.model_fields}
+        self._entries[user.id] = (values, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
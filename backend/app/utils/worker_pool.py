@@ -0,0 +1,93 @@
+import asyncio
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from app.core.metrics import metrics
+
+class PoolSaturated(Exception):
+    def __init__(self, retry_after: int, message: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class PoolTimeout(Exception):
+    pass
+
+class WorkerPool:
+    """
+    Runs CPU-heavy work in worker processes so it never blocks the event
+    loop. Work that releases the GIL can pass a ThreadPoolExecutor as
+    `executor_class` instead.
+
+    At most `max_pending` jobs may be queued or running; beyond that `run`
+    fails fast with PoolSaturated carrying `busy_message`, and a job that
+    outlives `timeout` raises PoolTimeout with `timeout_message`, so each
+    pool can word its errors for its own callers. A job's slot is only
+    released when its worker actually finishes, so a job that outlives
+    `timeout` keeps counting against the limit after its caller has given
+    up on it.
+
+    Metrics are recorded under `name`, so several pools can be told apart.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+        *,
+        name: str,
+        busy_message: str,
+        timeout_message: str,
+        executor_class: type[Executor] = ProcessPoolExecutor,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.name = name
+        self.busy_message = busy_message
+        self.timeout_message = timeout_message
+        self.executor_class = executor_class
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self.executor_class(max_workers=self.workers)
+        return self._executor
+
+    def _retry_after(self) -> int:
+        typical = metrics.percentile(f"{self.name}.seconds", 0.5) or self.timeout / 4
+        return max(1, math.ceil(typical * self._pending / self.workers))
+
+    def _release(self, started: float) -> None:
+        self._pending -= 1
+        metrics.observe(f"{self.name}.seconds", time.perf_counter() - started)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            metrics.increment(f"{self.name}.rejected")
+            raise PoolSaturated(self._retry_after(), self.busy_message)
+
+        self._pending += 1
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+        except BaseException:
+            self._pending -= 1
+            raise
+        future.add_done_callback(lambda _: self._release(started))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except TimeoutError:
+            metrics.increment(f"{self.name}.timeouts")
+            raise PoolTimeout(self.timeout_message)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,83 @@
+"""
+Compares CommentCRUD.create_many against the previous add/commit/refresh
+implementation.
+
+Needs a migrated database configured through the usual settings. Run from
+the backend directory:
+
+    python -m benchmarks.bench_comment_insert --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from app.crud.comment_crud import comment_crud
+from app.db.database import AsyncSessionLocal
+from app.models.comment_model import Comment
+from app.models.draft_model import Draft
+from app.models.user_model import User
+from app.schemas.comment_schema import CommentCreate
+
+async def legacy_create_many(db, *, objs_in, draft_id):
+    comments = []
+    for obj_in in objs_in:
+        db_obj = Comment(comment=obj_in.comment,
+            sentiment_analysis=obj_in.sentiment_analysis,
+            sentiment_score=obj_in.sentiment_score,
+            sentiment_keywords=obj_in.sentiment_keywords,
+            draft_id=draft_id)
+        db.add(db_obj)
+        comments.append(db_obj)
+    await db.commit()
+    for db_obj in comments:
+        await db.refresh(db_obj)
+    return comments
+
+def make_comments(n: int) -> list[CommentCreate]:
+    return [
+        CommentCreate(
+            comment=f"Benchmark comment {i} about the proposed amendment",
+            sentiment_analysis="neutral",
+            sentiment_score=0.5,
+            sentiment_keywords="amendment",
+        )
+        for i in range(n)
+    ]
+
+async def timed(create_many, draft_id, objs_in) -> float:
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        created = await create_many(db, objs_in=objs_in, draft_id=draft_id)
+        elapsed = time.perf_counter() - started
+        assert len(created) == len(objs_in)
+        await db.execute(delete(Comment).where(Comment.draft_id == draft_id))
+        await db.commit()
+    return elapsed
+
+async def main(sizes: list[int]) -> None:
+    async with AsyncSessionLocal() as db:
+        user = User(username="bench", email=f"bench-{uuid4().hex}@example.com", hashed_password="-")
+        draft = Draft(draft="Benchmark draft", user_id=user.id)
+        db.add_all([user, draft])
+        await db.commit()
+
+    try:
+        print(f"{'rows':>8} {'legacy (s)':>12} {'bulk (s)':>12} {'speedup':>8}")
+        for n in sizes:
+            objs_in = make_comments(n)
+            legacy = await timed(legacy_create_many, draft.id, objs_in)
+            bulk = await timed(comment_crud.create_many, draft.id, objs_in)
+            print(f"{n:>8} {legacy:>12.3f} {bulk:>12.3f} {legacy / bulk:>7.1f}x")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Draft).where(Draft.id == draft.id))
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    asyncio.run(main(parser.parse_args().sizes))
@@ -0,0 +1,78 @@
+"""
+Measures authenticated requests/sec with get_current_user loading the user
+from the database, from the per-process user cache, and from token claims.
+
+Requests go in-process through the ASGI app to the metrics endpoint, which
+does nothing but authenticate, so the numbers isolate the auth overhead.
+Needs a migrated database configured through the usual settings. Run from
+the backend directory:
+
+    python -m benchmarks.bench_current_user --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.jwt import create_access_token, token_claims
+from app.db.database import AsyncSessionLocal
+from app.main import app
+from app.models.user_model import User
+from app.utils.user_cache import user_cache
+
+URL = f"{settings.API_V1_STR}/metrics/"
+
+MODES = {
+    # mode: (cache TTL, claims in token)
+    "db": (0, False),
+    "cache": (60, False),
+    "token": (0, True),
+}
+
+async def run(client: httpx.AsyncClient, token: str, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            response = await client.get(URL, headers={"Authorization": token})
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+async def main(requests: int, concurrency: int) -> None:
+    async with AsyncSessionLocal() as db:
+        user = User(username="bench", email=f"bench-{uuid4().hex}@example.com", hashed_password="-")
+        db.add(user)
+        await db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'mode':>6} {'req/s':>10}")
+            for mode, (ttl_seconds, claims) in MODES.items():
+                user_cache.clear()
+                user_cache.ttl_seconds = ttl_seconds
+                settings.AUTH_TOKEN_CLAIMS = claims
+                token = create_access_token(token_claims(user))
+                await run(client, token, min(requests, 100), concurrency)
+                rate = await run(client, token, requests, concurrency)
+                print(f"{mode:>6} {rate:>10.0f}")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,59 @@
+"""
+Compares rendering a report from a freshly parsed Template against the
+shared, precompiled report template environment.
+
+Needs no database. Run from the backend directory:
+
+    python -m benchmarks.bench_report_render --renders 1000
+"""
+import argparse
+import time
+
+from jinja2 import Template
+
+from app.utils.report_templates import REPORT_TEMPLATES, TEMPLATES_DIR, environment, render_report
+
+REPORT_DATA = {
+    "draft_info": {
+        "id": "00000000-0000-0000-0000-000000000000",
+        "title": "Benchmark draft, with a comma and \"quotes\"",
+        "created_date": "2025-01-01 12:00",
+    },
+    "overall_sentiment": {"score": 0.42, "label": "positive", "confidence": 0.87},
+    "comment_count": 250,
+    "draft_length": {"words": 1800, "characters": 10400, "sentences": 90, "avg_words_per_sentence": 20.0},
+    "readability_score": {"score": 48.2, "level": "difficult", "grade_level": 12.1},
+    "feedback_ratio": {
+        "critical": 40,
+        "supportive": 150,
+        "neutral": 60,
+        "ratio": "150:40",
+        "critical_percentage": 16.0,
+        "supportive_percentage": 60.0,
+    },
+    "actionable_insights": [
+        "✅ Excellent reception! Consider finalizing the draft",
+        "📊 Rich feedback collected - analyze patterns for improvements",
+    ],
+}
+
+def per_render(fn, renders: int) -> float:
+    started = time.perf_counter()
+    for _ in range(renders):
+        fn()
+    return (time.perf_counter() - started) / renders
+
+def main(renders: int) -> None:
+    print(f"{'format':>6} {'inline (ms)':>12} {'cached (ms)':>12} {'speedup':>8}")
+    for format, name in REPORT_TEMPLATES.items():
+        with open(f"{TEMPLATES_DIR}/{name}", encoding="utf-8") as f:
+            source = f.read()
+        environment.get_template(name)
+        inline = per_render(lambda: Template(source).render(**REPORT_DATA), renders)
+        cached = per_render(lambda: render_report(REPORT_DATA, format), renders)
+        print(f"{format:>6} {inline * 1000:>12.3f} {cached * 1000:>12.3f} {inline / cached:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=1_000)
+    main(parser.parse_args().renders)
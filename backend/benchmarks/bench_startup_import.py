@@ -0,0 +1,74 @@
+"""
+Measures the cold-start cost of importing the app with `python -X importtime`.
+
+Each run imports the module in a fresh interpreter and reports the wall
+time, the slowest top-level imports by cumulative time, and whether any of
+the modules that are meant to load lazily were imported at startup.
+Needs the usual settings in the environment, but no database or API key.
+Run from the backend directory:
+
+    python -m benchmarks.bench_startup_import --runs 5 --top 15
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# Only needed once an agent runs, a PDF is read or rendered, or a score is computed
+LAZY_MODULES = ("pydantic_ai", "openai", "weasyprint", "textstat", "PyPDF2")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def import_once(module: str) -> tuple[float, dict[str, int], set[str]]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level: dict[str, int] = {}
+    imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name.split(".")[0])
+        if len(indent) == 1:
+            top_level[name] = int(cumulative)
+    return elapsed, top_level, imported
+
+def main(module: str, runs: int, top: int) -> None:
+    times = []
+    cumulative: dict[str, list[int]] = {}
+    imported: set[str] = set()
+    for _ in range(runs):
+        elapsed, top_level, names = import_once(module)
+        times.append(elapsed)
+        imported |= names
+        for name, us in top_level.items():
+            cumulative.setdefault(name, []).append(us)
+
+    print(f"import {module}: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms over {runs} runs\n")
+    print(f"{'module':<40} {'cumulative (ms)':>16}")
+    slowest = sorted(cumulative.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in slowest[:top]:
+        print(f"{name:<40} {statistics.median(values) / 1000:>16.1f}")
+
+    eager = [name for name in LAZY_MODULES if name in imported]
+    print(f"\nlazy modules imported at startup: {', '.join(eager) or 'none'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.module, args.runs, args.top)
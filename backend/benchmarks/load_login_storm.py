@@ -0,0 +1,103 @@
+"""
+Measures event-loop lag while a burst of logins is in flight, with bcrypt
+run inline in the handler (the previous login) and in the password pool.
+
+A probe coroutine sleeps for a fixed interval and records how late it
+wakes up; that delay is what every other request on the worker would see.
+Needs a migrated database configured through the usual settings. Run from
+the backend directory:
+
+    python -m benchmarks.load_login_storm --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from app.api.v1.routers.login import login
+from app.core.jwt import create_access_token
+from app.core.security import hash_password, password_pool, verify_password
+from app.crud.user_crud import user_crud
+from app.db.database import AsyncSessionLocal
+from app.models.user_model import User
+from app.schemas.user_schema import UserLogin
+
+PROBE_INTERVAL = 0.01
+
+async def legacy_login(user_login, db):
+    user = await user_crud.get_by_email(db, user_login.email)
+    if not user or not verify_password(user_login.password, user.hashed_password):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    token = create_access_token({"sub": str(user.id)})
+    return {"access_token": token, "token_type": "bearer"}
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+async def storm(handler, user_login: UserLogin, logins: int, concurrency: int) -> dict:
+    lags: list[float] = []
+    rejected = 0
+    remaining = logins
+    stop = asyncio.Event()
+
+    async def worker():
+        nonlocal remaining, rejected
+        while remaining > 0:
+            remaining -= 1
+            async with AsyncSessionLocal() as db:
+                try:
+                    await handler(user_login, db)
+                except HTTPException as e:
+                    if e.status_code != 503:
+                        raise
+                    rejected += 1
+
+    prober = asyncio.create_task(probe(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+
+    lags.sort()
+    return {
+        "rate": (logins - rejected) / elapsed,
+        "rejected": rejected,
+        "p50": statistics.median(lags) * 1000,
+        "p99": lags[int(len(lags) * 0.99)] * 1000,
+        "max": lags[-1] * 1000,
+    }
+
+async def main(logins: int, concurrency: int) -> None:
+    password = uuid4().hex
+    async with AsyncSessionLocal() as db:
+        user = User(username="bench", email=f"bench-{uuid4().hex}@example.com",
+            hashed_password=hash_password(password))
+        db.add(user)
+        await db.commit()
+    user_login = UserLogin(email=user.email, password=password)
+
+    try:
+        print(f"{'handler':>8} {'logins/s':>9} {'503s':>6} {'lag p50 (ms)':>13} {'p99':>8} {'max':>8}")
+        for name, handler in [("inline", legacy_login), ("pool", login)]:
+            r = await storm(handler, user_login, logins, concurrency)
+            print(f"{name:>8} {r['rate']:>9.1f} {r['rejected']:>6} {r['p50']:>13.1f} {r['p99']:>8.1f} {r['max']:>8.1f}")
+    finally:
+        password_pool.shutdown()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency))
@@ -0,0 +1,9 @@
+import os
+
+# Settings requires these; nothing in the tests connects to the database
+os.environ.setdefault("PROJECT_NAME", "lexalytics-test")
+os.environ.setdefault("DATABASE_USER", "test")
+os.environ.setdefault("DATABASE_PASSWORD", "test")
+os.environ.setdefault("DATABASE_HOST", "localhost")
+os.environ.setdefault("DATABASE_PORT", "5432")
+os.environ.setdefault("DATABASE_NAME", "test")
@@ -0,0 +1,32 @@
+import asyncio
+from pathlib import Path
+from uuid import uuid4
+
+from app.utils.report_cache import ReportCache
+
+def test_invalidate_leaves_temp_files_of_writes_in_progress(tmp_path):
+    cache = ReportCache(max_bytes=1024, directory=str(tmp_path))
+    draft_id = uuid4()
+    (tmp_path / f"{draft_id}-v1.pdf").write_bytes(b"old")
+    in_progress = tmp_path / f"{draft_id}-v2.123.tmp"
+    in_progress.write_bytes(b"new")
+
+    asyncio.run(cache.invalidate(draft_id))
+
+    assert not (tmp_path / f"{draft_id}-v1.pdf").exists()
+    assert in_progress.exists()
+
+def test_write_racing_an_invalidation_is_dropped(tmp_path, monkeypatch):
+    cache = ReportCache(max_bytes=1024, directory=str(tmp_path))
+    draft_id = uuid4()
+
+    def replace(self, target):
+        # As if the temp file was removed between write_bytes and replace
+        self.unlink()
+        raise FileNotFoundError(self)
+
+    monkeypatch.setattr(Path, "replace", replace)
+    asyncio.run(cache.set(draft_id, "v1", "pdf", b"report"))
+
+    assert list(tmp_path.iterdir()) == []
+    assert asyncio.run(cache.get(draft_id, "v1", "pdf")) == b"report"
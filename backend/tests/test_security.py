@@ -0,0 +1,32 @@
+import asyncio
+
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.security import password_pool, verify_password_async
+
+def test_outdated_hash_is_replaced():
+    old_hash = bcrypt.using(rounds=4).hash("correct horse")
+
+    async def verify():
+        try:
+            return await verify_password_async("correct horse", old_hash)
+        finally:
+            password_pool.shutdown()
+
+    valid, new_hash = asyncio.run(verify())
+    assert valid
+    assert new_hash is not None
+    assert bcrypt.from_string(new_hash).rounds == settings.PASSWORD_BCRYPT_ROUNDS
+    assert bcrypt.verify("correct horse", new_hash)
+
+def test_current_hash_is_kept():
+    current = bcrypt.using(rounds=settings.PASSWORD_BCRYPT_ROUNDS).hash("correct horse")
+
+    async def verify():
+        try:
+            return await verify_password_async("correct horse", current)
+        finally:
+            password_pool.shutdown()
+
+    assert asyncio.run(verify()) == (True, None)
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.utils.agent import Sentiment
+from app.utils.sentiment_cache import SentimentCache
+
+@pytest.fixture
+def cache():
+    cache = SentimentCache(max_entries=100, ttl_seconds=60)
+    stored: dict = {}
+
+    # Keep the persistent tier in memory; nothing here needs Postgres
+    async def get_db(keys):
+        return {key: stored[key] for key in keys if key in stored}
+
+    async def set_db(items):
+        stored.update(items)
+
+    cache._get_db = get_db
+    cache._set_db = set_db
+    return cache
+
+def make_compute(calls: list[list[str]], delay: float = 0):
+    async def compute_many(texts: list[str]) -> list[Sentiment]:
+        calls.append(list(texts))
+        await asyncio.sleep(delay)
+        return [
+            Sentiment(sentiment_analysis="positive", sentiment_score=0.9, sentiment_keywords=text)
+            for text in texts
+        ]
+    return compute_many
+
+def test_duplicates_in_a_batch_are_analysed_once(cache):
+    calls: list[list[str]] = []
+    texts = ["Agree", "+1", "agree.", "The clause is vague", "+1", "Agree"]
+
+    results = asyncio.run(cache.get_or_compute_many(texts, make_compute(calls)))
+
+    assert calls == [["Agree", "+1", "The clause is vague"]]
+    assert [result.sentiment_keywords for result in results] == [
+        "Agree", "+1", "Agree", "The clause is vague", "+1", "Agree"
+    ]
+
+def test_concurrent_batches_share_inflight_texts(cache):
+    calls: list[list[str]] = []
+    compute_many = make_compute(calls, delay=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            cache.get_or_compute_many(["Agree", "Oppose"], compute_many),
+            cache.get_or_compute_many(["Agree", "Unclear"], compute_many),
+        )
+
+    first, second = asyncio.run(run())
+
+    analysed = [text for call in calls for text in call]
+    assert sorted(analysed) == ["Agree", "Oppose", "Unclear"]
+    assert first[0] == second[0]
+
+def test_cached_texts_skip_compute(cache):
+    calls: list[list[str]] = []
+    asyncio.run(cache.get_or_compute_many(["Agree", "Oppose"], make_compute(calls)))
+    asyncio.run(cache.get_or_compute_many(["Oppose", "agree", "New"], make_compute(calls)))
+
+    assert calls == [["Agree", "Oppose"], ["New"]]
@@ -0,0 +1,34 @@
+import random
+
+from app.utils.summariser import split_into_chunks, summary_key
+
+WORDS = ["the", "draft", "clause", "policy", "rule", "shall", "amend", "provide", "of", "and"]
+
+def make_pages(count: int) -> list[str]:
+    rng = random.Random(7)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(150, 900))) + f" (page {i})\n"
+        for i in range(count)
+    ]
+
+def keys(chunks: list[str]) -> set[str]:
+    return {summary_key(chunk, "prompt") for chunk in chunks}
+
+def test_chunks_respect_the_budget():
+    chunks = split_into_chunks(make_pages(60), max_tokens=2000)
+    assert "".join(chunks).count("(page") == 60
+    assert all(len(chunk) // 4 + 1 <= 2000 for chunk in chunks)
+
+def test_editing_a_middle_page_keeps_the_other_chunks():
+    pages = make_pages(60)
+    before = split_into_chunks(pages, max_tokens=2000)
+
+    pages[30] = pages[30].replace(" (page 30)", " a much longer page after the edit" * 40 + " (page 30)")
+    after = split_into_chunks(pages, max_tokens=2000)
+
+    unchanged = keys(before) & keys(after)
+    # Only chunks holding the edited page, or the page next to it, may differ
+    for chunk in after:
+        if summary_key(chunk, "prompt") not in unchanged:
+            assert "(page 30)" in chunk or "(page 31)" in chunk
+    assert len(unchanged) >= len(before) - 2
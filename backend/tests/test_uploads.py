@@ -0,0 +1,60 @@
+"""
+Guards the private Starlette and tempfile behaviour app.utils.uploads relies
+on; if one of these fails after an upgrade, revisit that module.
+"""
+import asyncio
+
+import pytest
+from starlette.formparsers import MultiPartParser
+from starlette.requests import Request
+
+from app.utils.uploads import _spooled_buffer, configure_upload_spooling, map_upload
+
+BOUNDARY = "lexalytics-test-boundary"
+
+def multipart_request(content: bytes) -> Request:
+    body = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="draft.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+@pytest.fixture
+def spool_limit():
+    original = MultiPartParser.spool_max_size
+    configure_upload_spooling(1024)
+    yield 1024
+    MultiPartParser.spool_max_size = original
+
+async def read_upload(content: bytes) -> tuple[bytes, bool]:
+    request = multipart_request(content)
+    form = await request.form()
+    upload = form["file"]
+    try:
+        buffered = _spooled_buffer(upload.file) is not None
+        with map_upload(upload.file) as mapped:
+            mapped.seek(0)
+            return mapped.read(), buffered
+    finally:
+        await form.close()
+
+def test_parser_uses_the_configured_spool_size(spool_limit):
+    content, buffered = asyncio.run(read_upload(b"x" * (spool_limit // 2)))
+    assert buffered
+    assert content == b"x" * (spool_limit // 2)
+
+def test_uploads_over_the_spool_size_go_to_disk(spool_limit):
+    content, buffered = asyncio.run(read_upload(b"y" * (spool_limit * 4)))
+    assert not buffered
+    assert content == b"y" * (spool_limit * 4)
@@ -0,0 +1,26 @@
+from app.models.user_model import User
+from app.utils.user_cache import UserCache
+
+def make_user() -> User:
+    return User(username="reviewer", email="reviewer@example.com", hashed_password="-")
+
+def test_hits_are_fresh_copies():
+    cache = UserCache(max_entries=10, ttl_seconds=60)
+    user = make_user()
+    cache.set(user)
+    user.username = "changed after caching"
+
+    first, second = cache.get(user.id), cache.get(user.id)
+    assert first is not user and first is not second
+    assert (first.id, first.username, first.email) == (user.id, "reviewer", "reviewer@example.com")
+
+def test_invalidate_and_disabled():
+    cache = UserCache(max_entries=10, ttl_seconds=60)
+    user = make_user()
+    cache.set(user)
+    cache.invalidate(user.id)
+    assert cache.get(user.id) is None
+
+    disabled = UserCache(max_entries=10, ttl_seconds=0)
+    disabled.set(user)
+    assert disabled.get(user.id) is None